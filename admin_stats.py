@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Admin Stats - Snapshot cache for the /admin and /dbstats dashboards
+Aggregates are computed by a background job and served from memory, so admin
+panels never scan live tables while users are active
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from telegram.ext import ContextTypes
+from database import DatabaseManager
+from workers import db_executor
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = int(os.environ.get("ADMIN_STATS_INTERVAL", "60"))
+SNAPSHOT_TTL = int(os.environ.get("ADMIN_STATS_TTL", "120"))
+
+
+class AdminStatsSnapshot:
+    """Last computed dashboard aggregates, refreshed at most once at a time"""
+
+    def __init__(self, ttl=120, executor=db_executor):
+        self.ttl = ttl
+        self.executor = executor
+        self._snapshot = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    @staticmethod
+    def _load():
+        with DatabaseManager(read_only=True) as db:
+            stats = db.get_admin_stats()
+        stats['refreshed_at'] = datetime.now()
+        return stats
+
+    async def refresh(self):
+        """Recompute the snapshot (concurrent callers share one query)"""
+        started = time.monotonic()
+        async with self._lock:
+            if self._snapshot is not None and self._expires_at - self.ttl >= started:
+                return self._snapshot  # refreshed while we waited
+            self._snapshot = await self.executor.run(self._load)
+            self._expires_at = time.monotonic() + self.ttl
+            self.refreshes += 1
+            return self._snapshot
+
+    async def get(self):
+        """Current snapshot - only hits the database if the job has fallen behind"""
+        if self._snapshot is not None and time.monotonic() < self._expires_at:
+            return self._snapshot
+        return await self.refresh()
+
+
+admin_stats = AdminStatsSnapshot(ttl=SNAPSHOT_TTL)
+
+
+async def refresh_admin_stats_job(context: ContextTypes.DEFAULT_TYPE):
+    """Keep the admin snapshot warm"""
+    try:
+        await admin_stats.refresh()
+    except Exception as e:
+        logger.error(f"❌ Admin stats refresh failed: {e}")
+
+
+def register_admin_stats_jobs(job_queue):
+    """Schedule the snapshot refresh"""
+    job_queue.run_repeating(refresh_admin_stats_job, interval=REFRESH_INTERVAL, first=10,
+                            name="admin_stats")
+    logger.info(f"✅ Admin stats refresh scheduled (every {REFRESH_INTERVAL}s, TTL {SNAPSHOT_TTL}s)")
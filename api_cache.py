@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+API Cache - Response cache tiers for API-SPORTS
+In-memory bounded LRU with per-entry expiry, plus an optional SQLite tier
+that keeps raw responses across restarts
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """LRU cache of API responses with per-entry TTL"""
+
+    def __init__(self, max_size=500):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (data, expires_at)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return cached data if present and fresh, else None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        data, expires_at = entry
+        if expires_at <= time.time():
+            # Expired entries are kept (until evicted) as a stale fallback
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_stale(self, key, max_stale=None):
+        """Return cached data even if expired (up to max_stale seconds past expiry), else None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        data, expires_at = entry
+        if max_stale is not None and time.time() - expires_at > max_stale:
+            return None
+
+        self._entries.move_to_end(key)
+        self.stale_hits += 1
+        return data
+
+    def set(self, key, data, ttl):
+        """Store data for ttl seconds, evicting least recently used entries"""
+        self._entries[key] = (data, time.time() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self):
+        """Cache counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
+
+
+class DiskCache:
+    """SQLite-backed store of raw responses with their expiry times"""
+
+    def __init__(self, path, keep_expired=24 * 60 * 60):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        # Drop entries too old to be useful even as stale data
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - keep_expired,))
+        self._conn.commit()
+        logger.info(f"✅ Disk cache ready at {path}")
+
+    @staticmethod
+    def _encode_key(key):
+        return json.dumps(key)
+
+    def get(self, key):
+        """Return (data, expires_at) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM responses WHERE key = ?",
+                (self._encode_key(key),)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, data, ttl):
+        """Persist data for ttl seconds"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, data, expires_at) VALUES (?, ?, ?)",
+                (self._encode_key(key), json.dumps(data), time.time() + ttl)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Async Database - asyncio counterpart of DatabaseManager
+Built on SQLAlchemy's create_async_engine (asyncpg for PostgreSQL, aiosqlite
+for SQLite) so handlers can await DB work without the worker thread pool.
+Statements come from the builders in database.py, so both managers issue
+the same SQL.
+"""
+
+import logging
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from models import DATABASE_URL, engine_options, Prediction, TennisPrediction, BasketballPrediction, \
+    PredictionFact, UserSportStats
+from database import (user_cache, upsert_insert, user_upsert_statement, user_lookup_statement,
+                      sport_stats_upsert_statement, prediction_fact_rows, recent_predictions_statement,
+                      todays_value_bets_statement, stats_result)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url):
+    """Swap the sync driver in a database URL for its asyncio driver"""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+_async_engine = None
+_session_factory = None
+
+
+def get_async_session_factory():
+    """Async engine and session factory, created on first use so unused pools cost nothing"""
+    global _async_engine, _session_factory
+    if _session_factory is None:
+        _async_engine = create_async_engine(async_url(DATABASE_URL), **engine_options)
+        _session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _session_factory
+
+
+async def dispose_async_engine():
+    """Close the async pool (call on shutdown)"""
+    global _async_engine, _session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = _session_factory = None
+
+
+class AsyncDatabaseManager:
+    """Same operations as DatabaseManager, awaitable"""
+
+    def __init__(self, session=None):
+        self.db = session or get_async_session_factory()()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def get_or_create_user(self, telegram_id: int, username: str = None, first_name: str = None, last_name: str = None):
+        """Get user or create if doesn't exist (single INSERT ... ON CONFLICT statement)"""
+        try:
+            result = await self.db.execute(
+                user_upsert_statement(upsert_insert(self.db), telegram_id, username, first_name, last_name),
+                execution_options={"populate_existing": True}
+            )
+            user = result.scalar_one_or_none()
+
+            if user is None:
+                # Existing user, nothing to write - plain read
+                user = (await self.db.execute(user_lookup_statement(telegram_id))).scalar_one()
+
+            await self.db.commit()
+            user_cache.set(user)
+            return user
+        except Exception as e:
+            logger.error(f"❌ get_or_create_user failed: {e}")
+            await self.db.rollback()
+            raise
+
+    async def get_user_id(self, telegram_id: int):
+        """Resolve a Telegram ID to users.id, from the identity cache when possible"""
+        identity = user_cache.get(telegram_id)
+        if identity:
+            return identity['id']
+        return (await self.get_or_create_user(telegram_id)).id
+
+    async def _save(self, sport, prediction):
+        self.db.add(prediction)
+        await self.db.flush()  # assigns ids and created_at defaults
+        await self.db.execute(insert(PredictionFact), prediction_fact_rows(sport, [prediction]))
+        await self.db.execute(sport_stats_upsert_statement(
+            upsert_insert(self.db), {(prediction.user_id, sport): (1, 0, 1)}
+        ))
+        await self.db.commit()
+        return prediction
+
+    async def save_prediction(self, telegram_id: int, home_team: str, away_team: str, league: str,
+                              predicted_result: str, home_prob: float, draw_prob: float,
+                              away_prob: float, confidence: float):
+        """Save user prediction"""
+        try:
+            prediction = await self._save('football', Prediction(
+                user_id=await self.get_user_id(telegram_id),
+                home_team=home_team,
+                away_team=away_team,
+                league=league,
+                predicted_result=predicted_result,
+                home_prob=home_prob,
+                draw_prob=draw_prob,
+                away_prob=away_prob,
+                confidence=confidence
+            ))
+            logger.info(f"✅ Prediction saved for user {telegram_id}")
+            return prediction
+        except Exception as e:
+            logger.error(f"❌ save_prediction failed: {e}")
+            await self.db.rollback()
+            raise
+
+    async def save_tennis_prediction(self, telegram_id: int, player1: str, player2: str,
+                                     tournament: str, surface: str, predicted_winner: str,
+                                     player1_prob: float, player2_prob: float, confidence: float):
+        """Save tennis prediction"""
+        try:
+            prediction = await self._save('tennis', TennisPrediction(
+                user_id=await self.get_user_id(telegram_id),
+                player1=player1,
+                player2=player2,
+                tournament=tournament,
+                surface=surface,
+                predicted_winner=predicted_winner,
+                player1_prob=player1_prob,
+                player2_prob=player2_prob,
+                confidence=confidence
+            ))
+            logger.info(f"✅ Tennis prediction saved for user {telegram_id}")
+            return prediction
+        except Exception as e:
+            logger.error(f"❌ save_tennis_prediction failed: {e}")
+            await self.db.rollback()
+            raise
+
+    async def save_basketball_prediction(self, telegram_id: int, home_team: str, away_team: str,
+                                         league: str, predicted_winner: str,
+                                         home_prob: float, away_prob: float, confidence: float):
+        """Save basketball prediction"""
+        try:
+            prediction = await self._save('basketball', BasketballPrediction(
+                user_id=await self.get_user_id(telegram_id),
+                home_team=home_team,
+                away_team=away_team,
+                league=league,
+                predicted_winner=predicted_winner,
+                home_prob=home_prob,
+                away_prob=away_prob,
+                confidence=confidence
+            ))
+            logger.info(f"✅ Basketball prediction saved for user {telegram_id}")
+            return prediction
+        except Exception as e:
+            logger.error(f"❌ save_basketball_prediction failed: {e}")
+            await self.db.rollback()
+            raise
+
+    async def _sport_stats(self, model, sport, telegram_id, recent_limit=5):
+        """Counters row plus the latest predictions for one sport"""
+        try:
+            user_id = await self.get_user_id(telegram_id)
+            counters = await self.db.get(UserSportStats, (user_id, sport))
+            recent = (await self.db.execute(recent_predictions_statement(model, user_id, recent_limit))).scalars().all()
+
+            if counters is None:
+                return stats_result(0, 0, recent, user_id)
+            return stats_result(counters.total, counters.correct, recent, user_id, counters.pending)
+        except Exception as e:
+            logger.error(f"❌ {sport} stats failed: {e}")
+            return stats_result(0, 0, [], None)
+
+    async def get_user_stats(self, telegram_id: int):
+        """Get user prediction statistics"""
+        return await self._sport_stats(Prediction, 'football', telegram_id)
+
+    async def get_tennis_stats(self, telegram_id: int):
+        """Get user tennis prediction statistics"""
+        return await self._sport_stats(TennisPrediction, 'tennis', telegram_id)
+
+    async def get_basketball_stats(self, telegram_id: int):
+        """Get user basketball prediction statistics"""
+        return await self._sport_stats(BasketballPrediction, 'basketball', telegram_id)
+
+    async def get_todays_value_bets(self):
+        """Get today's value bets"""
+        try:
+            bets = (await self.db.execute(todays_value_bets_statement())).scalars().all()
+            logger.info(f"✅ Retrieved {len(bets)} value bets")
+            return bets
+        except Exception as e:
+            logger.error(f"❌ get_todays_value_bets failed: {e}")
+            return []
+
+    async def close(self):
+        """Close database connection"""
+        if self.db:
+            await self.db.close()
@@ -13,8 +13,8 @@ logger = logging.getLogger(__name__)
 class BasketballDataManager:
     """Manages basketball data and predictions"""
     
-    def __init__(self):
-        self.api = SportsAPIClient()
+    def __init__(self, api_client=None):
+        self.api = api_client or SportsAPIClient()
         
         self.leagues = {
             '12': '🏀 NBA',
@@ -23,11 +23,11 @@ class BasketballDataManager:
             '13': '🏀 NCAA'
         }
     
-    def get_todays_matches(self):
+    async def get_todays_matches(self):
         """Get today's basketball matches"""
         # Try API first
         if self.api.api_key:
-            games_data = self.api.get_basketball_games_today()
+            games_data = await self.api.get_basketball_games_today()
             if games_data:
                 return self._format_api_games(games_data)
         
@@ -9,21 +9,30 @@ import sys
 import logging
 import random
 import asyncio
-from datetime import datetime, timedelta
 from typing import Dict, List, Set
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler, MessageHandler, filters
+from telegram.helpers import escape_markdown
 from flask import Flask
 from threading import Thread
 
 # ========== DATABASE IMPORTS ==========
-from models import init_db, User, Prediction, Bet, ValueBet, SystemLog
 from database import DatabaseManager
+from async_database import AsyncDatabaseManager, dispose_async_engine
+from db_router import read_router
+from migrate import schema_status, upgrade as upgrade_schema
+from workers import db_executor
+from prediction_writer import prediction_writer
 
 # ========== SPORTS MANAGERS ==========
 from football_manager import FootballDataManager
 from tennis_manager import TennisDataManager
 from basketball_manager import BasketballDataManager
+from sports_api_client import SportsAPIClient
+from prefetch import register_prefetch_jobs
+from partitions import register_partition_jobs
+from retention import register_retention_jobs
+from admin_stats import admin_stats, register_admin_stats_jobs
 
 # ========== CONFIGURATION ==========
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
@@ -31,6 +40,7 @@ API_KEY = os.environ.get("SPORTS_API_KEY") or os.environ.get("FOOTBALL_DATA_API_
 ADMIN_USER_ID = os.environ.get("ADMIN_USER_ID", "").split(",")  # Comma-separated admin IDs
 INVITE_ONLY = os.environ.get("INVITE_ONLY", "true").lower() == "true"  # Default: true
 DATABASE_URL = os.environ.get("DATABASE_URL")  # PostgreSQL connection string
+DB_AUTO_MIGRATE = os.environ.get("DB_AUTO_MIGRATE", "false").lower() == "true"  # Migrate at boot (local dev)
 
 if not BOT_TOKEN:
     print("❌ ERROR: BOT_TOKEN not set!")
@@ -59,9 +69,10 @@ def run_flask():
     app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
 
 # ========== GLOBAL INSTANCES ==========
-data_manager = FootballDataManager()
-tennis_manager = TennisDataManager()
-basketball_manager = BasketballDataManager()
+sports_api = SportsAPIClient()  # Shared connection pools for all sports
+data_manager = FootballDataManager(sports_api)
+tennis_manager = TennisDataManager(sports_api)
+basketball_manager = BasketballDataManager(sports_api)
 
 # ========== USER STORAGE (Temporary - will migrate to DB) ==========
 class SimpleUserStorage:
@@ -89,6 +100,14 @@ class SimpleUserStorage:
 
 user_storage = SimpleUserStorage()
 
+# ========== DATABASE WORKERS ==========
+async def run_read(func, *args, **kwargs):
+    """Run func(db, ...) with a read-only DatabaseManager (replica when healthy) on the DB worker threads"""
+    def call():
+        with DatabaseManager(read_only=True) as db:
+            return func(db, *args, **kwargs)
+    return await db_executor.run(call)
+
 # ========== ACCESS CONTROL ==========
 def access_control(func):
     """Decorator to check if user is allowed"""
@@ -134,16 +153,15 @@ def access_control(func):
 @access_control
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Main menu - Sport Selection"""
-    # Create or update user in database
+    # Create or update user in database (awaited natively, no worker thread)
     try:
-        db = DatabaseManager()
-        user = db.get_or_create_user(
-            telegram_id=update.effective_user.id,
-            username=update.effective_user.username,
-            first_name=update.effective_user.first_name,
-            last_name=update.effective_user.last_name
-        )
-        db.close()
+        async with AsyncDatabaseManager() as db:
+            await db.get_or_create_user(
+                telegram_id=update.effective_user.id,
+                username=update.effective_user.username,
+                first_name=update.effective_user.first_name,
+                last_name=update.effective_user.last_name
+            )
         logger.info(f"✅ User {update.effective_user.id} synced to database")
     except Exception as e:
         logger.error(f"❌ Database sync failed: {e}")
@@ -300,26 +318,20 @@ async def quick_predict_command(update: Update, context: ContextTypes.DEFAULT_TY
     goals = analysis['goals']
     value = analysis['value_bet']
     
-    # ========== SAVE TO DATABASE ==========
-    try:
-        db = DatabaseManager()
-        prediction = db.save_prediction(
-            telegram_id=update.effective_user.id,
-            home_team=home,
-            away_team=away,
-            league="Quick Prediction",
-            predicted_result=analysis['prediction'],
-            home_prob=probs['home'],
-            draw_prob=probs['draw'],
-            away_prob=probs['away'],
-            confidence=analysis['confidence']
-        )
-        db.close()
-        logger.info(f"✅ Prediction saved to DB: ID {prediction.id}")
-        save_note = "✅ *Saved to your history*"
-    except Exception as e:
-        logger.error(f"❌ Database save failed: {e}")
-        save_note = "⚠️ *History not saved*"
+    # ========== SAVE TO DATABASE (write-behind) ==========
+    queued = prediction_writer.submit(
+        'football',
+        telegram_id=update.effective_user.id,
+        home_team=home,
+        away_team=away,
+        league="Quick Prediction",
+        predicted_result=analysis['prediction'],
+        home_prob=probs['home'],
+        draw_prob=probs['draw'],
+        away_prob=probs['away'],
+        confidence=analysis['confidence']
+    )
+    save_note = "✅ *Saved to your history*" if queued else "⚠️ *History not saved*"
     # ========== END DATABASE SAVE ==========
     
     response = f"""
@@ -349,7 +361,7 @@ _Enhanced with AI analysis_
 async def todays_matches_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Text command: /matches"""
     try:
-        matches = data_manager.get_todays_matches()
+        matches = await data_manager.get_todays_matches()
         
         if not matches:
             response = "No matches scheduled for today."
@@ -419,9 +431,7 @@ async def value_bets_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     """Value bets command - FROM DATABASE"""
     # ========== GET FROM DATABASE ==========
     try:
-        db = DatabaseManager()
-        bets = db.get_todays_value_bets()
-        db.close()
+        bets = await run_read(DatabaseManager.get_todays_value_bets)
         
         if not bets:
             response = "💎 *NO VALUE BETS TODAY*\n\nNo strong value bets identified for today."
@@ -492,20 +502,8 @@ async def mystats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"📊 Getting stats for user {user_id}")
     
     try:
-        # Get database connection
-        db = DatabaseManager()
-        
-        # First, ensure user exists in database
-        user = db.get_or_create_user(
-            telegram_id=user_id,
-            username=update.effective_user.username,
-            first_name=first_name,
-            last_name=update.effective_user.last_name
-        )
-        
-        # Get user statistics
-        stats = db.get_user_stats(user_id)
-        db.close()
+        # Read-only: served by the replica when it is caught up
+        stats = await run_read(DatabaseManager.get_user_stats, user_id)
         
         total = stats['total_predictions']
         correct = stats['correct_predictions']
@@ -626,6 +624,10 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 /nbastandings - View NBA standings
 /basketstats - Your basketball statistics
 
+*ALL SPORTS:*
+/allstats - Football, tennis and basketball statistics together
+/leaderboard [sport] - Top predictors by accuracy and your rank
+
 *GENERAL COMMANDS:*
 /help - Show this help message
 
@@ -647,7 +649,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 @access_control
 async def tennis_matches_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show today's tennis matches"""
-    matches = tennis_manager.get_todays_matches()
+    matches = await tennis_manager.get_todays_matches()
     
     if not matches:
         response = "🎾 *NO TENNIS MATCHES TODAY*\n\nNo tennis matches scheduled for today."
@@ -698,26 +700,20 @@ async def tennis_predict_command(update: Update, context: ContextTypes.DEFAULT_T
     predicted_winner = analysis['predicted_winner']
     confidence = analysis['confidence']
     
-    # ========== SAVE TO DATABASE ==========
-    try:
-        db = DatabaseManager()
-        prediction = db.save_tennis_prediction(
-            telegram_id=update.effective_user.id,
-            player1=player1,
-            player2=player2,
-            tournament="Quick Prediction",
-            surface=analysis['surface'],
-            predicted_winner=predicted_winner,
-            player1_prob=probs['player1'],
-            player2_prob=probs['player2'],
-            confidence=confidence
-        )
-        db.close()
-        logger.info(f"✅ Tennis prediction saved to DB: ID {prediction.id}")
-        save_note = "✅ *Saved to your history*"
-    except Exception as e:
-        logger.error(f"❌ Tennis database save failed: {e}")
-        save_note = "⚠️ *History not saved*"
+    # ========== SAVE TO DATABASE (write-behind) ==========
+    queued = prediction_writer.submit(
+        'tennis',
+        telegram_id=update.effective_user.id,
+        player1=player1,
+        player2=player2,
+        tournament="Quick Prediction",
+        surface=analysis['surface'],
+        predicted_winner=predicted_winner,
+        player1_prob=probs['player1'],
+        player2_prob=probs['player2'],
+        confidence=confidence
+    )
+    save_note = "✅ *Saved to your history*" if queued else "⚠️ *History not saved*"
     # ========== END DATABASE SAVE ==========
     
     response = f"""
@@ -760,7 +756,7 @@ async def tennis_rankings_command(update: Update, context: ContextTypes.DEFAULT_
         elif 'atp' in cmd:
             tour = 'ATP'
     
-    rankings_data = tennis_manager.get_rankings(tour)
+    rankings_data = await tennis_manager.get_rankings(tour)
     
     if not rankings_data or not rankings_data['rankings']:
         await update.message.reply_text("❌ Could not fetch rankings.")
@@ -800,12 +796,8 @@ async def tennis_stats_command(update: Update, context: ContextTypes.DEFAULT_TYP
     logger.info(f"📊 Getting tennis stats for user {user_id}")
     
     try:
-        # Get database connection
-        db = DatabaseManager()
-        
         # Get user statistics
-        stats = db.get_tennis_stats(user_id)
-        db.close()
+        stats = await run_read(DatabaseManager.get_tennis_stats, user_id)
         
         total = stats['total_predictions']
         correct = stats['correct_predictions']
@@ -899,7 +891,7 @@ _Error details: Database connection failed_
 @access_control
 async def basketball_matches_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show today's basketball games"""
-    games = basketball_manager.get_todays_matches()
+    games = await basketball_manager.get_todays_matches()
     
     if not games:
         response = "🏀 *NO BASKETBALL GAMES TODAY*\n\nNo basketball games scheduled for today."
@@ -950,25 +942,19 @@ async def basketball_predict_command(update: Update, context: ContextTypes.DEFAU
     predicted_winner = analysis['predicted_winner']
     confidence = analysis['confidence']
     
-    # ========== SAVE TO DATABASE ==========
-    try:
-        db = DatabaseManager()
-        prediction = db.save_basketball_prediction(
-            telegram_id=update.effective_user.id,
-            home_team=home,
-            away_team=away,
-            league="Quick Prediction",
-            predicted_winner=predicted_winner,
-            home_prob=probs['home'],
-            away_prob=probs['away'],
-            confidence=confidence
-        )
-        db.close()
-        logger.info(f"✅ Basketball prediction saved to DB: ID {prediction.id}")
-        save_note = "✅ *Saved to your history*"
-    except Exception as e:
-        logger.error(f"❌ Basketball database save failed: {e}")
-        save_note = "⚠️ *History not saved*"
+    # ========== SAVE TO DATABASE (write-behind) ==========
+    queued = prediction_writer.submit(
+        'basketball',
+        telegram_id=update.effective_user.id,
+        home_team=home,
+        away_team=away,
+        league="Quick Prediction",
+        predicted_winner=predicted_winner,
+        home_prob=probs['home'],
+        away_prob=probs['away'],
+        confidence=confidence
+    )
+    save_note = "✅ *Saved to your history*" if queued else "⚠️ *History not saved*"
     # ========== END DATABASE SAVE ==========
     
     response = f"""
@@ -1025,9 +1011,7 @@ async def basketball_stats_command(update: Update, context: ContextTypes.DEFAULT
     first_name = update.effective_user.first_name
     
     try:
-        db = DatabaseManager()
-        stats = db.get_basketball_stats(user_id)
-        db.close()
+        stats = await run_read(DatabaseManager.get_basketball_stats, user_id)
         
         total = stats['total_predictions']
         correct = stats['correct_predictions']
@@ -1082,6 +1066,84 @@ _Your basketball predictions will be saved automatically_
         reply_markup = InlineKeyboardMarkup(keyboard)
         await update.callback_query.edit_message_text(response, reply_markup=reply_markup, parse_mode='Markdown')
 
+@access_control
+async def allstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show football, tennis and basketball statistics together"""
+    user_id = update.effective_user.id
+    first_name = update.effective_user.first_name
+    
+    try:
+        stats = await run_read(DatabaseManager.get_all_stats, user_id)
+        
+        response = f"""
+📊 *YOUR MULTI-SPORT STATISTICS*
+
+👤 User: {first_name}
+🆔 ID: `{user_id}`
+"""
+        for sport, icon in (('football', '⚽'), ('tennis', '🎾'), ('basketball', '🏀')):
+            sport_stats = stats[sport]
+            response += f"\n{icon} *{sport.title()}:* {sport_stats['total_predictions']} predictions, "
+            response += f"{sport_stats['correct_predictions']} correct ({sport_stats['accuracy']}%)\n"
+            for pred in sport_stats['recent_predictions'][:2]:
+                res_icon = "✅" if pred.is_correct else ("❌" if pred.is_correct == False else "⏳")
+                response += f"  • {pred.home} vs {pred.away} ({res_icon})\n"
+        
+        logger.info(f"✅ Cross-sport stats shown for user {user_id}")
+        
+    except Exception as e:
+        logger.error(f"❌ Database error in allstats: {e}")
+        response = "❌ Could not load your statistics."
+    
+    await update.message.reply_text(response, parse_mode='Markdown')
+
+LEADERBOARD_SPORTS = {
+    'football': 'football', 'soccer': 'football', 'calcio': 'football',
+    'tennis': 'tennis',
+    'basketball': 'basketball', 'basket': 'basketball', 'nba': 'basketball',
+}
+
+@access_control
+async def leaderboard_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show the accuracy leaderboard for a sport and the caller's rank"""
+    user_id = update.effective_user.id
+    sport = LEADERBOARD_SPORTS.get(context.args[0].lower() if context.args else 'football')
+    
+    if sport is None:
+        await update.message.reply_text("❌ Usage: /leaderboard [football|tennis|basketball]")
+        return
+    
+    try:
+        board = await run_read(DatabaseManager.get_leaderboard, sport, user_id)
+        icon = {'football': '⚽', 'tennis': '🎾', 'basketball': '🏀'}[sport]
+        
+        response = f"""
+🏆 *{sport.upper()} LEADERBOARD* {icon}
+
+_Ranked by accuracy, minimum {board['min_settled']} settled predictions_
+
+"""
+        if not board['entries']:
+            response += "No ranked users yet.\n"
+        for entry in board['entries']:
+            marker = " 👈" if entry['is_me'] else ""
+            response += (f"{entry['rank']}. {escape_markdown(entry['name'])} - {entry['accuracy']}% "
+                         f"({entry['correct']}/{entry['settled']}){marker}\n")
+        
+        me = board['me']
+        if me:
+            response += f"\n👤 *Your rank:* #{me['rank']} - {me['accuracy']}% ({me['correct']}/{me['settled']})"
+        else:
+            response += f"\n👤 Settle {board['min_settled']} {sport} predictions to get ranked."
+        
+        logger.info(f"✅ {sport.title()} leaderboard shown for user {user_id}")
+        
+    except Exception as e:
+        logger.error(f"❌ Database error in leaderboard: {e}")
+        response = "❌ Could not load the leaderboard."
+    
+    await update.message.reply_text(response, parse_mode='Markdown')
+
 # ========== ADMIN COMMANDS ==========
 @access_control
 async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1094,24 +1156,56 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # ========== DATABASE STATS ==========
     try:
-        db = DatabaseManager()
-        total_users = db.db.query(User).count()
-        total_predictions = db.db.query(Prediction).count()
-        total_value_bets = db.db.query(ValueBet).filter(ValueBet.is_active == True).count()
-        db.close()
+        stats = await admin_stats.get()
+        total_users = stats['total_users']
+        total_predictions = stats['total_predictions']
+        total_value_bets = stats['active_value_bets']
     except Exception as e:
         logger.error(f"❌ Database stats failed: {e}")
         total_users = total_predictions = total_value_bets = "N/A"
     
+    cache = sports_api.get_cache_stats()
+    workers = db_executor.stats()
+    writer = prediction_writer.stats()
+    reads = read_router.stats()
+    replica_lag = "down" if reads['lag'] is None else f"{reads['lag']:.1f}s"
+    replica_line = (
+        f"• Reads: replica {reads['replica_reads']} | primary {reads['primary_reads']} | "
+        f"fallbacks {reads['fallbacks']} | lag {replica_lag}"
+        if reads['replica_configured'] else "• Read replica: not configured"
+    )
+    quota_lines = "\n".join(
+        f"• {q['name']}: {q['daily_remaining']}/{q['daily_limit']} today | "
+        f"{q['minute_remaining']}/{q['minute_limit']} per min | {q['throttled']} throttled | circuit {q['circuit']}"
+        for q in sports_api.get_quota_status()
+    )
+    
     response = f"""
 🔐 *ADMIN PANEL*
 
 📊 *DATABASE STATISTICS:*
 • Total Users: {total_users}
-• Total Predictions: {total_predictions}
+• Total Predictions (all sports): {total_predictions}
 • Active Value Bets: {total_value_bets}
 • Invite-Only Mode: {'✅ Enabled' if INVITE_ONLY else '❌ Disabled'}
 
+🌐 *API CACHE:*
+• Entries: {cache['size']}/{cache['max_size']}
+• Hits: {cache['hits']} | Stale: {cache['stale_hits']} | Misses: {cache['misses']} ({cache['hit_rate']}% hit rate)
+• Evictions: {cache['evictions']} | Coalesced: {cache['coalesced']}
+
+📡 *API QUOTA:*
+{quota_lines}
+
+🧵 *DB WORKERS:*
+• Active: {workers['active']}/{workers['workers']} | Queued: {workers['queued']} | Waiting: {workers['waiting']}
+• Peak queue: {workers['peak_queued']} | Completed: {workers['completed']} | Failed: {workers['failed']}
+{replica_line}
+
+📝 *PREDICTION WRITER:*
+• Pending: {writer['pending']} | Saved: {writer['flushed']} in {writer['batches']} batches
+• Failures: {writer['failures']} | Spooled: {writer['spooled']} | Rejected: {writer['dead_lettered']} | Dropped: {writer['dropped']}
+
 ⚙️ *ADMIN COMMANDS:*
 /dbstats - Detailed database statistics
 /adduser [id] - Add user to allowed list
@@ -1141,24 +1235,17 @@ async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        db = DatabaseManager()
-        
-        # Get detailed stats
-        total_users = db.db.query(User).count()
-        active_users = db.db.query(User).filter(User.is_active == True).count()
-        premium_users = db.db.query(User).filter(User.is_premium == True).count()
-        
-        total_predictions = db.db.query(Prediction).count()
-        correct_predictions = db.db.query(Prediction).filter(Prediction.is_correct == True).count()
-        pending_predictions = db.db.query(Prediction).filter(Prediction.is_correct == None).count()
-        
-        total_value_bets = db.db.query(ValueBet).count()
-        active_value_bets = db.db.query(ValueBet).filter(ValueBet.is_active == True).count()
-        
-        # Recent activity
-        recent_users = db.db.query(User).order_by(User.last_seen.desc()).limit(5).all()
-        
-        db.close()
+        # Served from the snapshot refreshed by the admin_stats job
+        stats = await admin_stats.get()
+        total_users = stats['total_users']
+        active_users = stats['active_users']
+        premium_users = stats['premium_users']
+        total_predictions = stats['total_predictions']
+        correct_predictions = stats['correct_predictions']
+        pending_predictions = stats['pending_predictions']
+        total_value_bets = stats['total_value_bets']
+        active_value_bets = stats['active_value_bets']
+        recent_users = stats['recent_users']
         
         # Calculate accuracy
         accuracy = (correct_predictions / (total_predictions - pending_predictions) * 100) if (total_predictions - pending_predictions) > 0 else 0
@@ -1172,7 +1259,7 @@ async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • Premium Users: {premium_users}
 
 🎯 *PREDICTIONS:*
-• Total Predictions: {total_predictions}
+• Total Predictions (all sports): {total_predictions}
 • Correct Predictions: {correct_predictions}
 • Pending Results: {pending_predictions}
 • System Accuracy: {accuracy:.1f}%
@@ -1187,7 +1274,7 @@ async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             last_seen = user.last_seen.strftime("%Y-%m-%d %H:%M") if user.last_seen else "Never"
             response += f"{i}. {user.first_name} (ID: {user.telegram_id}) - {last_seen}\n"
         
-        response += f"\n📅 *Last Updated:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        response += f"\n📅 *Last Updated:* {stats['refreshed_at'].strftime('%Y-%m-%d %H:%M:%S')}"
         
     except Exception as e:
         logger.error(f"❌ Database stats failed: {e}")
@@ -1279,7 +1366,7 @@ async def show_standings(update: Update, league_code: str):
     query = update.callback_query
     await query.answer()
     
-    standings_data = data_manager.get_standings(league_code)
+    standings_data = await data_manager.get_standings(league_code)
     
     if not standings_data:
         await query.edit_message_text("❌ Could not fetch standings.")
@@ -1396,6 +1483,18 @@ async def show_basket_predict_info_callback(update: Update, context: ContextType
     
     await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
 
+# ========== LIFECYCLE HOOKS ==========
+async def post_init(application: Application):
+    """Start background writers once the event loop is running"""
+    await prediction_writer.start()
+
+async def post_shutdown(application: Application):
+    """Drain queued predictions, then release API connections, DB workers and the async pool"""
+    await prediction_writer.stop()
+    await sports_api.close()
+    db_executor.shutdown(wait=True)
+    await dispose_async_engine()
+
 # ========== MAIN FUNCTION ==========
 def main():
     """Initialize and start the bot"""
@@ -1403,34 +1502,17 @@ def main():
     print("⚽ SERIE AI BOT - WITH DATABASE")
     print("=" * 60)
     
-    # Initialize database with debug info
+    # Schema check - one SELECT on alembic_version; DDL runs in `python migrate.py`
     try:
-        print("🔍 Testing database connection...")
-        init_db()
-        print("✅ Database tables created")
-        
-        # Test connection
-        from sqlalchemy import text
-        from models import engine
-        
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT version()"))
-            db_version = result.fetchone()[0]
-            print(f"✅ PostgreSQL Version: {db_version}")
-            
-            # Check tables
-            result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-            """))
-            tables = [row[0] for row in result]
-            print(f"✅ Tables found: {tables}")
-            
-            if 'users' in tables and 'predictions' in tables:
-                print("✅ Required tables exist")
-            else:
-                print("⚠️  Missing some tables")
+        print("🔍 Checking database schema...")
+        current, head = schema_status()
+        if current == head:
+            print(f"✅ Database schema current (revision {current})")
+        elif DB_AUTO_MIGRATE:
+            print(f"⚠️  Schema at {current or 'none'}, head is {head} - migrating (DB_AUTO_MIGRATE)")
+            upgrade_schema()
+        else:
+            print(f"⚠️  Schema at {current or 'none'}, head is {head} - run `python migrate.py`")
         
         # Create sample data
         from init_database import create_sample_data
@@ -1455,7 +1537,7 @@ def main():
     flask_thread.start()
     
     # Build bot application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = Application.builder().token(BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
     
     # Register command handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -1482,6 +1564,8 @@ def main():
     application.add_handler(CommandHandler("basketpredict", basketball_predict_command))
     application.add_handler(CommandHandler("nbastandings", basketball_standings_command))
     application.add_handler(CommandHandler("basketstats", basketball_stats_command))
+    application.add_handler(CommandHandler("allstats", allstats_command))
+    application.add_handler(CommandHandler("leaderboard", leaderboard_command))
     application.add_handler(CommandHandler("basketvalue", basketball_value_bets_command))
     
     # Admin commands
@@ -1491,6 +1575,12 @@ def main():
     # Register button handler
     application.add_handler(CallbackQueryHandler(button_handler))
     
+    # Background jobs - keep API data warm
+    register_prefetch_jobs(application.job_queue, sports_api, data_manager.leagues)
+    register_partition_jobs(application.job_queue)
+    register_retention_jobs(application.job_queue)
+    register_admin_stats_jobs(application.job_queue)
+    
     print("✅ Bot initialized with database features")
     print("   Commands available:")
     print("   • /start - Main menu")
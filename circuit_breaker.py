@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker - Fail fast while an upstream API host is unhealthy
+closed -> open after repeated failures, half-open probe after a cool-down
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+
+    def allow_request(self):
+        """True if a request may go upstream right now"""
+        if self.state == self.CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_started = None
+            logger.info(f"🔌 {self.name} circuit half-open - probing")
+
+        # Half-open: let a single probe through (re-armed if it never reports back)
+        if self.probe_started is None or now - self.probe_started >= self.reset_timeout:
+            self.probe_started = now
+            return True
+        return False
+
+    def record_success(self):
+        """Upstream answered - close the circuit"""
+        if self.state != self.CLOSED:
+            logger.info(f"✅ {self.name} circuit closed - host recovered")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probe_started = None
+
+    def record_failure(self):
+        """Upstream failed - open the circuit once the threshold is reached"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"🔌 {self.name} circuit open after {self.failures} failures - failing fast for {self.reset_timeout}s")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probe_started = None
@@ -0,0 +1,24 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+
+# models.py exits without a DATABASE_URL - the tests build their own engines anyway
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from models import Base
+
+
+@pytest.fixture
+def make_database(tmp_path):
+    """make_database(name) -> URL of a fresh SQLite database with the full schema"""
+    engines = []
+
+    def make(name):
+        url = f"sqlite:///{tmp_path / name}"
+        engines.append(create_engine(url))
+        Base.metadata.create_all(bind=engines[-1])
+        return url
+
+    yield make
+    for engine in engines:
+        engine.dispose()
@@ -1,63 +1,309 @@
-from models import SessionLocal, User, Prediction, Bet, ValueBet, SystemLog
+from db_router import read_router
+from models import SessionLocal, User, Prediction, Bet, ValueBet, SystemLog, TennisPrediction, BasketballPrediction, UserSportStats, PredictionFact, LeaderboardEntry
 from datetime import datetime, timedelta
-from sqlalchemy import desc, func, text
+from sqlalchemy import desc, func, insert, select, update, delete, or_, and_, case, literal, null, true, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import OrderedDict
+import threading
 import logging
+import time
+import os
 
 logger = logging.getLogger(__name__)
 
+# last_seen is only rewritten once it is older than this (profile changes are always written)
+USER_TOUCH_INTERVAL = timedelta(seconds=int(os.environ.get("USER_TOUCH_INTERVAL", "300")))
+
+class UserIdentityCache:
+    """Bounded LRU of telegram_id -> user id and flags, with TTL"""
+    
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # telegram_id -> (identity, expires_at)
+        self._lock = threading.Lock()  # shared by the DB worker threads
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, telegram_id):
+        """Cached {'id', 'is_premium'} for a Telegram user, or None"""
+        with self._lock:
+            entry = self._entries.get(telegram_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(telegram_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(telegram_id)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, user):
+        """Remember a User row"""
+        identity = {'id': user.id, 'is_premium': bool(user.is_premium)}
+        with self._lock:
+            self._entries[user.telegram_id] = (identity, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.telegram_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, telegram_id):
+        """Forget a user (call after changing their row)"""
+        with self._lock:
+            self._entries.pop(telegram_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+# Expires with the last_seen interval, so every cache miss is a chance to touch last_seen
+# (get_or_create_user, or the batched UPDATE in bulk_save_predictions)
+user_cache = UserIdentityCache(
+    max_size=int(os.environ.get("USER_CACHE_SIZE", "10000")),
+    ttl=USER_TOUCH_INTERVAL.total_seconds()
+)
+
+def upsert_insert(session):
+    """Dialect INSERT construct that supports ON CONFLICT (PostgreSQL, SQLite)"""
+    if session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert
+    return sqlite.insert
+
+# Prediction table per sport
+PREDICTION_MODELS = {
+    'football': Prediction,
+    'tennis': TennisPrediction,
+    'basketball': BasketballPrediction
+}
+
+SPORT_BY_MODEL = {model: sport for sport, model in PREDICTION_MODELS.items()}
+
+# Column holding the settled outcome, per sport
+ACTUAL_RESULT_COLUMNS = {
+    'football': 'actual_result',
+    'tennis': 'actual_winner',
+    'basketball': 'actual_winner'
+}
+
+# prediction_facts column -> per-sport column
+FACT_COLUMNS = {
+    'football': {'home': 'home_team', 'away': 'away_team', 'league': 'league', 'predicted': 'predicted_result',
+                 'actual': 'actual_result', 'home_prob': 'home_prob', 'draw_prob': 'draw_prob', 'away_prob': 'away_prob'},
+    'tennis': {'home': 'player1', 'away': 'player2', 'league': 'tournament', 'predicted': 'predicted_winner',
+               'actual': 'actual_winner', 'home_prob': 'player1_prob', 'away_prob': 'player2_prob'},
+    'basketball': {'home': 'home_team', 'away': 'away_team', 'league': 'league', 'predicted': 'predicted_winner',
+                   'actual': 'actual_winner', 'home_prob': 'home_prob', 'away_prob': 'away_prob'}
+}
+
+# Users need this many settled predictions in a sport to be ranked
+LEADERBOARD_MIN_SETTLED = int(os.environ.get("LEADERBOARD_MIN_SETTLED", "5"))
+
+# Cross-sport history only reads this far back, so PostgreSQL prunes older partitions
+HISTORY_WINDOW = timedelta(days=int(os.environ.get("HISTORY_WINDOW_DAYS", "90")))
+
+def fact_row(sport, values):
+    """prediction_facts values for a per-sport row (values must include id and created_at)"""
+    row = {
+        'sport': sport,
+        'id': values['id'],
+        'created_at': values['created_at'],
+        'user_id': values.get('user_id'),
+        'confidence': values.get('confidence'),
+        'is_correct': values.get('is_correct')
+    }
+    for fact_column, column in FACT_COLUMNS[sport].items():
+        row[fact_column] = values.get(column)
+    return row
+
+# ========== STATEMENT BUILDERS (shared with async_database.py) ==========
+
+def user_upsert_statement(dialect_insert, telegram_id, username=None, first_name=None, last_name=None):
+    """ORM select over INSERT ... ON CONFLICT ... RETURNING users
+    
+    Yields the User when it was created or touched, nothing when the row was already current.
+    """
+    now = datetime.utcnow()
+    stmt = dialect_insert(User).values(
+        telegram_id=telegram_id,
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        last_seen=now
+    )
+    excluded = stmt.excluded
+    
+    # Only touch the row when the profile changed or last_seen is stale
+    needs_update = or_(
+        User.last_seen.is_(None),
+        User.last_seen < now - USER_TOUCH_INTERVAL,
+        *[
+            and_(excluded[field].isnot(None), excluded[field].is_distinct_from(getattr(User, field)))
+            for field in ('username', 'first_name', 'last_name')
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            'last_seen': excluded.last_seen,
+            'username': func.coalesce(excluded.username, User.username),
+            'first_name': func.coalesce(excluded.first_name, User.first_name),
+            'last_name': func.coalesce(excluded.last_name, User.last_name)
+        },
+        where=needs_update
+    ).returning(User)
+    return select(User).from_statement(stmt)
+
+def user_lookup_statement(telegram_id):
+    return select(User).where(User.telegram_id == telegram_id)
+
+def sport_stats_upsert_statement(dialect_insert, deltas):
+    """Add {(user_id, sport): (total, correct, pending)} deltas to user_sport_stats"""
+    stmt = dialect_insert(UserSportStats).values([
+        {'user_id': user_id, 'sport': sport, 'total': total, 'correct': correct,
+         'pending': pending, 'updated_at': datetime.utcnow()}
+        for (user_id, sport), (total, correct, pending) in deltas.items()
+    ])
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[UserSportStats.user_id, UserSportStats.sport],
+        set_={
+            'total': UserSportStats.total + excluded.total,
+            'correct': UserSportStats.correct + excluded.correct,
+            'pending': UserSportStats.pending + excluded.pending,
+            'updated_at': excluded.updated_at
+        }
+    )
+
+def leaderboard_refresh_statement(dialect_insert, *filters):
+    """Upsert leaderboard_entries from user_sport_stats (filters narrow it, e.g. to one user and sport)"""
+    settled = UserSportStats.total - UserSportStats.pending
+    stmt = dialect_insert(LeaderboardEntry).from_select(
+        ['sport', 'user_id', 'settled', 'correct', 'accuracy', 'updated_at'],
+        select(
+            UserSportStats.sport,
+            UserSportStats.user_id,
+            settled,
+            UserSportStats.correct,
+            UserSportStats.correct * 100.0 / settled,
+            literal(datetime.utcnow())
+        ).where(settled >= max(LEADERBOARD_MIN_SETTLED, 1), *filters)
+    )
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[LeaderboardEntry.sport, LeaderboardEntry.user_id],
+        set_={
+            'settled': excluded.settled,
+            'correct': excluded.correct,
+            'accuracy': excluded.accuracy,
+            'updated_at': excluded.updated_at
+        }
+    )
+
+def prediction_fact_rows(sport, predictions):
+    """prediction_facts values for flushed ORM predictions"""
+    return [
+        fact_row(sport, {column.key: getattr(prediction, column.key) for column in prediction.__table__.columns})
+        for prediction in predictions
+    ]
+
+def recent_predictions_statement(model, user_id, limit=5):
+    return select(model).where(model.user_id == user_id).order_by(desc(model.created_at)).limit(limit)
+
+def todays_value_bets_statement(limit=10):
+    today = datetime.utcnow()
+    tomorrow = today + timedelta(days=1)
+    return select(ValueBet).where(
+        ValueBet.is_active == True,
+        ValueBet.expires_at > today,
+        ValueBet.expires_at < tomorrow
+    ).order_by(desc(ValueBet.edge)).limit(limit)
+
+def stats_result(total, correct, recent, user_id, pending=0):
+    accuracy = (correct / total * 100) if total > 0 else 0
+    return {
+        'total_predictions': total,
+        'correct_predictions': correct,
+        'pending_predictions': pending,
+        'accuracy': round(accuracy, 1),
+        'recent_predictions': recent,
+        'user_id': user_id
+    }
+
 class DatabaseManager:
     """Handles all database operations with error handling"""
     
-    def __init__(self):
-        self.db = None
-        try:
-            self.db = SessionLocal()
-            # Test connection
-            self.db.execute(text("SELECT 1"))
-            logger.info("✅ Database connection successful")
-        except Exception as e:
-            logger.error(f"❌ Database connection failed: {e}")
-            raise
+    def __init__(self, session=None, read_only=False):
+        # Sessions are cheap - a pooled connection is only checked out on first query.
+        # read_only sessions may come from the replica and must not write.
+        self.read_only = read_only
+        self.db = session or (read_router.read_session() if read_only else SessionLocal())
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def get_or_create_user(self, telegram_id: int, username: str = None, first_name: str = None, last_name: str = None):
-        """Get user or create if doesn't exist"""
+        """Get user or create if doesn't exist (single INSERT ... ON CONFLICT statement)"""
         try:
-            user = self.db.query(User).filter(User.telegram_id == telegram_id).first()
+            user = self.db.execute(
+                user_upsert_statement(upsert_insert(self.db), telegram_id, username, first_name, last_name),
+                execution_options={"populate_existing": True}
+            ).scalar_one_or_none()
             
-            if not user:
-                user = User(
-                    telegram_id=telegram_id,
-                    username=username,
-                    first_name=first_name,
-                    last_name=last_name,
-                    last_seen=datetime.utcnow()
-                )
-                self.db.add(user)
-                self.db.commit()
-                self.db.refresh(user)
-                logger.info(f"✅ Created new user: {telegram_id}")
-            else:
-                user.last_seen = datetime.utcnow()
-                user.username = username or user.username
-                user.first_name = first_name or user.first_name
-                user.last_name = last_name or user.last_name
-                self.db.commit()
+            if user is None:
+                # Existing user, nothing to write - plain read
+                user = self.db.execute(user_lookup_statement(telegram_id)).scalar_one()
             
+            self.db.commit()
+            user_cache.set(user)
             return user
         except Exception as e:
             logger.error(f"❌ get_or_create_user failed: {e}")
             self.db.rollback()
             raise
     
+    def get_user_id(self, telegram_id: int):
+        """Resolve a Telegram ID to users.id, from the identity cache when possible"""
+        identity = user_cache.get(telegram_id)
+        if identity:
+            return identity['id']
+        if self.read_only:
+            # No upsert on a replica - unknown (or not yet replicated) users have no rows to read
+            user = self.db.execute(user_lookup_statement(telegram_id)).scalar_one_or_none()
+            if user is None:
+                return None
+            user_cache.set(user)
+            return user.id
+        return self.get_or_create_user(telegram_id).id
+    
+    def set_user_premium(self, telegram_id: int, is_premium: bool, subscription_ends: datetime = None):
+        """Change premium status and drop the cached identity"""
+        try:
+            self.db.query(User).filter(User.telegram_id == telegram_id).update({
+                User.is_premium: is_premium,
+                User.subscription_ends: subscription_ends
+            })
+            self.db.commit()
+            user_cache.invalidate(telegram_id)
+        except Exception as e:
+            logger.error(f"❌ set_user_premium failed: {e}")
+            self.db.rollback()
+            raise
+    
     def save_prediction(self, telegram_id: int, home_team: str, away_team: str, league: str,
                        predicted_result: str, home_prob: float, draw_prob: float, 
                        away_prob: float, confidence: float):
         """Save user prediction"""
         try:
-            user = self.get_or_create_user(telegram_id)
+            user_id = self.get_user_id(telegram_id)
             
             prediction = Prediction(
-                user_id=user.id,
+                user_id=user_id,
                 home_team=home_team,
                 away_team=away_team,
                 league=league,
@@ -69,6 +315,8 @@ class DatabaseManager:
             )
             
             self.db.add(prediction)
+            self._add_facts('football', [prediction])
+            self._bump_sport_stats({(user_id, 'football'): (1, 0, 1)})
             self.db.commit()
             logger.info(f"✅ Prediction saved for user {telegram_id}")
             return prediction
@@ -77,58 +325,341 @@ class DatabaseManager:
             self.db.rollback()
             raise
     
-    def get_user_stats(self, telegram_id: int):
-        """Get user prediction statistics"""
+    def bulk_save_predictions(self, rows):
+        """Insert queued predictions in one transaction (rows carry 'sport' and 'telegram_id')"""
+        try:
+            # Resolve users - cache first, then one query for the rest
+            user_ids = {}
+            missing = []
+            for telegram_id in {row['telegram_id'] for row in rows}:
+                identity = user_cache.get(telegram_id)
+                if identity:
+                    user_ids[telegram_id] = identity['id']
+                else:
+                    missing.append(telegram_id)
+            
+            if missing:
+                for user in self.db.query(User).filter(User.telegram_id.in_(missing)).all():
+                    user_cache.set(user)
+                    user_ids[user.telegram_id] = user.id
+                # Same throttle as get_or_create_user, one UPDATE for the batch
+                now = datetime.utcnow()
+                self.db.execute(
+                    update(User).where(
+                        User.telegram_id.in_(missing),
+                        or_(User.last_seen.is_(None), User.last_seen < now - USER_TOUCH_INTERVAL)
+                    ).values(last_seen=now),
+                    execution_options={"synchronize_session": False}
+                )
+                for telegram_id in set(missing) - user_ids.keys():
+                    user_ids[telegram_id] = self.get_or_create_user(telegram_id).id
+            
+            # One multi-row INSERT per sport table, one counter upsert for the batch
+            values_by_model = {}
+            deltas = {}
+            for row in rows:
+                values = {k: v for k, v in row.items() if k not in ('sport', 'telegram_id')}
+                values['user_id'] = user_ids[row['telegram_id']]
+                values_by_model.setdefault(PREDICTION_MODELS[row['sport']], []).append(values)
+                
+                is_correct = values.get('is_correct')
+                total, correct, pending = deltas.get((values['user_id'], row['sport']), (0, 0, 0))
+                deltas[(values['user_id'], row['sport'])] = (
+                    total + 1, correct + (is_correct is True), pending + (is_correct is None)
+                )
+            
+            facts = []
+            for model, values in values_by_model.items():
+                # RETURNING in parameter order pairs each generated id with its row
+                ids = self.db.execute(
+                    insert(model).returning(model.id, sort_by_parameter_order=True), values
+                ).scalars().all()
+                sport = SPORT_BY_MODEL[model]
+                facts.extend(fact_row(sport, {**row, 'id': row_id}) for row, row_id in zip(values, ids))
+            self.db.execute(insert(PredictionFact), facts)
+            self._bump_sport_stats(deltas)
+            
+            self.db.commit()
+            logger.info(f"✅ Bulk saved {len(rows)} predictions")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"❌ bulk_save_predictions failed: {e}")
+            self.db.rollback()
+            raise
+    
+    def settle_prediction(self, sport: str, prediction_id: int, is_correct: bool, actual: str = None):
+        """Record the outcome of a pending prediction, update the user's counters and leaderboard row
+        
+        Returns False if the prediction does not exist or was already settled.
+        """
         try:
-            user = self.get_or_create_user(telegram_id)
+            model = PREDICTION_MODELS[sport]
+            values = {'is_correct': is_correct}
+            if actual is not None:
+                values[ACTUAL_RESULT_COLUMNS[sport]] = actual
             
-            # Total predictions
-            total = self.db.query(Prediction).filter(Prediction.user_id == user.id).count()
+            # Only pending rows settle, so counters move exactly once per prediction
+            settled = self.db.execute(
+                update(model)
+                .where(model.id == prediction_id, model.is_correct.is_(None))
+                .values(**values)
+                .returning(model.user_id, model.created_at)
+            ).one_or_none()
+            if settled is None:
+                self.db.rollback()
+                return False
+            user_id, created_at = settled
             
-            # Correct predictions
-            correct = self.db.query(Prediction).filter(
-                Prediction.user_id == user.id,
-                Prediction.is_correct == True
-            ).count()
+            # created_at pins the fact row to a single partition
+            self.db.execute(
+                update(PredictionFact)
+                .where(PredictionFact.sport == sport,
+                       PredictionFact.id == prediction_id,
+                       PredictionFact.created_at == created_at)
+                .values(is_correct=is_correct, **({'actual': actual} if actual is not None else {}))
+            )
             
-            # Recent predictions
-            recent = self.db.query(Prediction).filter(
-                Prediction.user_id == user.id
-            ).order_by(desc(Prediction.created_at)).limit(5).all()
+            self._bump_sport_stats({(user_id, sport): (0, 1 if is_correct else 0, -1)})
+            self.db.execute(leaderboard_refresh_statement(
+                upsert_insert(self.db), UserSportStats.user_id == user_id, UserSportStats.sport == sport
+            ))
+            self.db.commit()
+            logger.info(f"✅ Settled {sport} prediction {prediction_id}: {'correct' if is_correct else 'wrong'}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ settle_prediction failed: {e}")
+            self.db.rollback()
+            raise
+    
+    def _add_facts(self, sport, predictions):
+        """Mirror newly added ORM predictions into prediction_facts (caller commits)"""
+        self.db.flush()  # assigns ids and created_at defaults
+        self.db.execute(insert(PredictionFact), prediction_fact_rows(sport, predictions))
+    
+    # ========== STATS COUNTERS ==========
+    
+    def _bump_sport_stats(self, deltas):
+        """Add {(user_id, sport): (total, correct, pending)} deltas to user_sport_stats (caller commits)"""
+        if not deltas:
+            return
+        self.db.execute(sport_stats_upsert_statement(upsert_insert(self.db), deltas))
+    
+    def rebuild_sport_stats(self):
+        """Recompute user_sport_stats and leaderboard_entries from the prediction tables (backfill / repair)
+        
+        Only counts rows still in the tables - run it before enabling prediction retention.
+        """
+        try:
+            self.db.execute(delete(UserSportStats))
+            now = datetime.utcnow()
+            for sport, model in PREDICTION_MODELS.items():
+                self.db.execute(insert(UserSportStats).from_select(
+                    ['user_id', 'sport', 'total', 'correct', 'pending', 'updated_at'],
+                    select(
+                        model.user_id,
+                        literal(sport),
+                        func.count(),
+                        func.count(case((model.is_correct == True, 1))),
+                        func.count(case((model.is_correct.is_(None), 1))),
+                        literal(now)
+                    ).where(model.user_id.isnot(None)).group_by(model.user_id)
+                ))
+            self.db.execute(delete(LeaderboardEntry))
+            self.db.execute(leaderboard_refresh_statement(upsert_insert(self.db)))
+            self.db.commit()
+            rows = self.db.query(UserSportStats).count()
+            logger.info(f"✅ Rebuilt user_sport_stats ({rows} rows) and the leaderboard")
+            return rows
+        except Exception as e:
+            logger.error(f"❌ rebuild_sport_stats failed: {e}")
+            self.db.rollback()
+            raise
+    
+    def ensure_sport_stats(self):
+        """Backfill the counters once, on a database that predates them"""
+        if self.db.query(UserSportStats.user_id).first() is not None:
+            return False
+        if not any(self.db.query(model.id).first() for model in PREDICTION_MODELS.values()):
+            return False
+        self.rebuild_sport_stats()
+        return True
+    
+    # ========== LEADERBOARD ==========
+    
+    def get_leaderboard(self, sport: str, telegram_id: int, limit: int = 10):
+        """Top users by accuracy for a sport, plus the caller's rank
+        
+        Both reads are range scans on ix_leaderboard_rank; the rank counts
+        the entries ahead of the caller, ties share a rank.
+        """
+        try:
+            rows = self.db.execute(
+                select(LeaderboardEntry, User.first_name, User.username)
+                .join(User, User.id == LeaderboardEntry.user_id)
+                .where(LeaderboardEntry.sport == sport)
+                .order_by(desc(LeaderboardEntry.accuracy), desc(LeaderboardEntry.correct), LeaderboardEntry.user_id)
+                .limit(limit)
+            ).all()
             
-            # Calculate accuracy
-            accuracy = (correct / total * 100) if total > 0 else 0
+            user_id = self.get_user_id(telegram_id)
+            entries = []
+            rank, previous = 0, None
+            for position, (entry, first_name, username) in enumerate(rows, 1):
+                if (entry.accuracy, entry.correct) != previous:
+                    rank, previous = position, (entry.accuracy, entry.correct)
+                entries.append({
+                    'rank': rank,
+                    'name': first_name or username or f"User {entry.user_id}",
+                    'accuracy': round(entry.accuracy, 1),
+                    'correct': entry.correct,
+                    'settled': entry.settled,
+                    'is_me': entry.user_id == user_id
+                })
             
-            logger.info(f"✅ Stats retrieved for user {telegram_id}: {total} predictions")
+            me = None
+            entry = self.db.get(LeaderboardEntry, (sport, user_id)) if user_id else None
+            if entry is not None:
+                ahead = self.db.execute(
+                    select(func.count()).select_from(LeaderboardEntry).where(
+                        LeaderboardEntry.sport == sport,
+                        or_(
+                            LeaderboardEntry.accuracy > entry.accuracy,
+                            and_(LeaderboardEntry.accuracy == entry.accuracy,
+                                 LeaderboardEntry.correct > entry.correct)
+                        )
+                    )
+                ).scalar()
+                me = {
+                    'rank': ahead + 1,
+                    'accuracy': round(entry.accuracy, 1),
+                    'correct': entry.correct,
+                    'settled': entry.settled
+                }
             
-            return {
-                'total_predictions': total,
-                'correct_predictions': correct,
-                'accuracy': round(accuracy, 1),
-                'recent_predictions': recent,
-                'user': user
-            }
+            logger.info(f"✅ {sport.title()} leaderboard retrieved for user {telegram_id}")
+            return {'sport': sport, 'entries': entries, 'me': me, 'min_settled': LEADERBOARD_MIN_SETTLED}
+        except Exception as e:
+            logger.error(f"❌ get_leaderboard failed: {e}")
+            return {'sport': sport, 'entries': [], 'me': None, 'min_settled': LEADERBOARD_MIN_SETTLED}
+    
+    def get_admin_stats(self, recent_users: int = 5):
+        """Dashboard aggregates in one statement, plus the most recently seen users
+        
+        Each table is scanned once: users, user_sport_stats and value_bets are
+        aggregated in their own one-row subquery and the three are cross-joined.
+        """
+        users = select(
+            func.count().label('total_users'),
+            func.count(case((User.is_active == True, 1))).label('active_users'),
+            func.count(case((User.is_premium == True, 1))).label('premium_users')
+        ).subquery()
+        predictions = select(
+            func.coalesce(func.sum(UserSportStats.total), 0).label('total_predictions'),
+            func.coalesce(func.sum(UserSportStats.correct), 0).label('correct_predictions'),
+            func.coalesce(func.sum(UserSportStats.pending), 0).label('pending_predictions')
+        ).subquery()
+        value_bets = select(
+            func.count().label('total_value_bets'),
+            func.count(case((ValueBet.is_active == True, 1))).label('active_value_bets')
+        ).subquery()
+        
+        row = self.db.execute(
+            select(users, predictions, value_bets)
+            .select_from(users.join(predictions, true()).join(value_bets, true()))
+        ).one()
+        
+        stats = dict(row._mapping)
+        stats['recent_users'] = self.db.query(User).order_by(User.last_seen.desc()).limit(recent_users).all()
+        return stats
+    
+    # ========== STATS ==========
+    
+    def _sport_stats(self, model, sport, user_id, recent_limit=5):
+        """Counters row plus the latest predictions for one sport"""
+        if user_id is None:
+            # Unknown user on a read-only session - don't let user_id IS NULL match orphan rows
+            return stats_result(0, 0, [], None)
+        counters = self.db.get(UserSportStats, (user_id, sport))
+        recent = self.db.execute(recent_predictions_statement(model, user_id, recent_limit)).scalars().all()
+        
+        if counters is None:
+            return stats_result(0, 0, recent, user_id)
+        return stats_result(counters.total, counters.correct, recent, user_id, counters.pending)
+    
+    def get_user_stats(self, telegram_id: int):
+        """Get user prediction statistics"""
+        try:
+            user_id = self.get_user_id(telegram_id)
+            stats = self._sport_stats(Prediction, 'football', user_id)
+            logger.info(f"✅ Stats retrieved for user {telegram_id}: {stats['total_predictions']} predictions")
+            return stats
         except Exception as e:
             logger.error(f"❌ get_user_stats failed: {e}")
-            return {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0,
-                'recent_predictions': [],
-                'user': None
-            }
+            return stats_result(0, 0, [], None)
+    
+    def get_all_stats(self, telegram_id: int, recent_limit: int = 5):
+        """Football, tennis and basketball statistics in one round-trip
+        
+        Recent rows (last HISTORY_WINDOW_DAYS) come from prediction_facts as lightweight
+        (sport, home, away, is_correct, created_at) tuples, tennis players as home/away.
+        """
+        try:
+            user_id = self.get_user_id(telegram_id)
+            if user_id is None:
+                return {sport: stats_result(0, 0, [], None) for sport in PREDICTION_MODELS}
+            
+            # Counter rows come back with position 0, recent predictions with 1..N
+            parts = [select(
+                UserSportStats.sport,
+                null().label('home'),
+                null().label('away'),
+                null().label('is_correct'),
+                null().label('created_at'),
+                UserSportStats.total,
+                UserSportStats.correct,
+                UserSportStats.pending,
+                literal(0).label('position')
+            ).where(UserSportStats.user_id == user_id)]
+            # Recent rows from the unified fact table - the created_at window prunes old partitions
+            parts.append(select(
+                PredictionFact.sport,
+                PredictionFact.home,
+                PredictionFact.away,
+                PredictionFact.is_correct,
+                PredictionFact.created_at,
+                null().label('total'),
+                null().label('correct'),
+                null().label('pending'),
+                func.row_number().over(
+                    partition_by=PredictionFact.sport, order_by=desc(PredictionFact.created_at)
+                ).label('position')
+            ).where(
+                PredictionFact.user_id == user_id,
+                PredictionFact.created_at >= datetime.utcnow() - HISTORY_WINDOW
+            ))
+            ranked = union_all(*parts).subquery()
+            rows = self.db.execute(
+                select(ranked).where(ranked.c.position <= recent_limit)
+                .order_by(ranked.c.sport, ranked.c.position)
+            ).all()
+            
+            stats = {sport: stats_result(0, 0, [], user_id) for sport in PREDICTION_MODELS}
+            for row in rows:
+                if row.position == 0:
+                    stats[row.sport] = stats_result(row.total, row.correct, [], user_id, row.pending)
+                else:
+                    stats[row.sport]['recent_predictions'].append(row)
+            
+            logger.info(f"✅ Cross-sport stats retrieved for user {telegram_id}")
+            return stats
+        except Exception as e:
+            logger.error(f"❌ get_all_stats failed: {e}")
+            return {sport: stats_result(0, 0, [], None) for sport in PREDICTION_MODELS}
     
     def get_todays_value_bets(self):
         """Get today's value bets"""
         try:
-            today = datetime.utcnow()
-            tomorrow = today + timedelta(days=1)
-            
-            bets = self.db.query(ValueBet).filter(
-                ValueBet.is_active == True,
-                ValueBet.expires_at > today,
-                ValueBet.expires_at < tomorrow
-            ).order_by(desc(ValueBet.edge)).limit(10).all()
+            bets = self.db.execute(todays_value_bets_statement()).scalars().all()
             
             logger.info(f"✅ Retrieved {len(bets)} value bets")
             return bets
@@ -136,6 +667,34 @@ class DatabaseManager:
             logger.error(f"❌ get_todays_value_bets failed: {e}")
             return []
     
+    def deactivate_expired_value_bets(self, batch_size: int = 500, max_batches: int = 20):
+        """Flip is_active off for expired value bets, one bounded batch per transaction"""
+        deactivated = 0
+        try:
+            for _ in range(max_batches):
+                now = datetime.utcnow()
+                ids = self.db.execute(
+                    select(ValueBet.id)
+                    .where(ValueBet.is_active == True, ValueBet.expires_at <= now)
+                    .limit(batch_size)
+                ).scalars().all()
+                if not ids:
+                    break
+                self.db.execute(
+                    update(ValueBet).where(ValueBet.id.in_(ids)).values(is_active=False)
+                )
+                self.db.commit()
+                deactivated += len(ids)
+                if len(ids) < batch_size:
+                    break
+            if deactivated:
+                logger.info(f"✅ Deactivated {deactivated} expired value bets")
+            return deactivated
+        except Exception as e:
+            logger.error(f"❌ deactivate_expired_value_bets failed: {e}")
+            self.db.rollback()
+            raise
+    
     # ========== TENNIS METHODS ==========
     
     def save_tennis_prediction(self, telegram_id: int, player1: str, player2: str, 
@@ -144,10 +703,10 @@ class DatabaseManager:
         """Save tennis prediction"""
         try:
             from models import TennisPrediction
-            user = self.get_or_create_user(telegram_id)
+            user_id = self.get_user_id(telegram_id)
             
             prediction = TennisPrediction(
-                user_id=user.id,
+                user_id=user_id,
                 player1=player1,
                 player2=player2,
                 tournament=tournament,
@@ -159,6 +718,8 @@ class DatabaseManager:
             )
             
             self.db.add(prediction)
+            self._add_facts('tennis', [prediction])
+            self._bump_sport_stats({(user_id, 'tennis'): (1, 0, 1)})
             self.db.commit()
             logger.info(f"✅ Tennis prediction saved for user {telegram_id}")
             return prediction
@@ -170,44 +731,13 @@ class DatabaseManager:
     def get_tennis_stats(self, telegram_id: int):
         """Get user tennis prediction statistics"""
         try:
-            from models import TennisPrediction
-            user = self.get_or_create_user(telegram_id)
-            
-            # Total predictions
-            total = self.db.query(TennisPrediction).filter(TennisPrediction.user_id == user.id).count()
-            
-            # Correct predictions
-            correct = self.db.query(TennisPrediction).filter(
-                TennisPrediction.user_id == user.id,
-                TennisPrediction.is_correct == True
-            ).count()
-            
-            # Recent predictions
-            recent = self.db.query(TennisPrediction).filter(
-                TennisPrediction.user_id == user.id
-            ).order_by(desc(TennisPrediction.created_at)).limit(5).all()
-            
-            # Calculate accuracy
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            logger.info(f"✅ Tennis stats retrieved for user {telegram_id}: {total} predictions")
-            
-            return {
-                'total_predictions': total,
-                'correct_predictions': correct,
-                'accuracy': round(accuracy, 1),
-                'recent_predictions': recent,
-                'user': user
-            }
+            user_id = self.get_user_id(telegram_id)
+            stats = self._sport_stats(TennisPrediction, 'tennis', user_id)
+            logger.info(f"✅ Tennis stats retrieved for user {telegram_id}: {stats['total_predictions']} predictions")
+            return stats
         except Exception as e:
             logger.error(f"❌ get_tennis_stats failed: {e}")
-            return {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0,
-                'recent_predictions': [],
-                'user': None
-            }
+            return stats_result(0, 0, [], None)
     
     # ========== BASKETBALL METHODS ==========
     
@@ -217,10 +747,10 @@ class DatabaseManager:
         """Save basketball prediction"""
         try:
             from models import BasketballPrediction
-            user = self.get_or_create_user(telegram_id)
+            user_id = self.get_user_id(telegram_id)
             
             prediction = BasketballPrediction(
-                user_id=user.id,
+                user_id=user_id,
                 home_team=home_team,
                 away_team=away_team,
                 league=league,
@@ -231,6 +761,8 @@ class DatabaseManager:
             )
             
             self.db.add(prediction)
+            self._add_facts('basketball', [prediction])
+            self._bump_sport_stats({(user_id, 'basketball'): (1, 0, 1)})
             self.db.commit()
             logger.info(f"✅ Basketball prediction saved for user {telegram_id}")
             return prediction
@@ -242,45 +774,14 @@ class DatabaseManager:
     def get_basketball_stats(self, telegram_id: int):
         """Get user basketball prediction statistics"""
         try:
-            from models import BasketballPrediction
-            user = self.get_or_create_user(telegram_id)
-            
-            # Total predictions
-            total = self.db.query(BasketballPrediction).filter(BasketballPrediction.user_id == user.id).count()
-            
-            # Correct predictions
-            correct = self.db.query(BasketballPrediction).filter(
-                BasketballPrediction.user_id == user.id,
-                BasketballPrediction.is_correct == True
-            ).count()
-            
-            # Recent predictions
-            recent = self.db.query(BasketballPrediction).filter(
-                BasketballPrediction.user_id == user.id
-            ).order_by(desc(BasketballPrediction.created_at)).limit(5).all()
-            
-            # Calculate accuracy
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            logger.info(f"✅ Basketball stats retrieved for user {telegram_id}: {total} predictions")
-            
-            return {
-                'total_predictions': total,
-                'correct_predictions': correct,
-                'accuracy': round(accuracy, 1),
-                'recent_predictions': recent,
-                'user': user
-            }
+            user_id = self.get_user_id(telegram_id)
+            stats = self._sport_stats(BasketballPrediction, 'basketball', user_id)
+            logger.info(f"✅ Basketball stats retrieved for user {telegram_id}: {stats['total_predictions']} predictions")
+            return stats
         except Exception as e:
             logger.error(f"❌ get_basketball_stats failed: {e}")
-            return {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0,
-                'recent_predictions': [],
-                'user': None
-            }
-
+            return stats_result(0, 0, [], None)
+    
     def close(self):
         """Close database connection"""
         if self.db:
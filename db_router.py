@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+DB Router - Send read-only sessions to a replica, fall back to the primary
+The replica is used only while it answers and its replay lag is within
+DB_REPLICA_MAX_LAG seconds; the lag probe is cached for DB_REPLICA_CHECK_INTERVAL
+"""
+
+import os
+import time
+import logging
+import threading
+from sqlalchemy import text
+from models import SessionLocal, ReplicaSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Zero when the replica has replayed everything it received, else time since the last replayed commit
+POSTGRES_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReadRouter:
+    """Chooses the session factory for read-only work"""
+
+    def __init__(self, primary_factory, replica_factory=None, max_lag=5.0, check_interval=10.0):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()  # shared by the DB worker threads
+        self._checked_at = None
+        self._healthy = False
+        self.lag = None
+
+        # Counters
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    def measure_lag(self):
+        """Replica lag in seconds (0 on SQLite) - raises if the replica is unreachable"""
+        session = self.replica_factory()
+        try:
+            if session.get_bind().dialect.name != 'postgresql':
+                session.execute(text("SELECT 1"))
+                return 0.0
+            return float(session.execute(POSTGRES_LAG_QUERY).scalar())
+        finally:
+            session.close()
+
+    def replica_available(self):
+        """True if the replica is reachable and caught up (cached between checks)"""
+        if self.replica_factory is None:
+            return False
+
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._healthy
+            try:
+                self.lag = self.measure_lag()
+                healthy = self.lag <= self.max_lag
+                if not healthy:
+                    logger.warning(f"⚠️ Replica {self.lag:.1f}s behind - reading from primary")
+            except Exception as e:
+                self.lag = None
+                healthy = False
+                logger.warning(f"⚠️ Replica unavailable - reading from primary: {e}")
+            if healthy and not self._healthy and self._checked_at is not None:
+                logger.info("✅ Replica caught up - routing reads to replica")
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+            return healthy
+
+    def read_session(self):
+        """Session for read-only work - replica if usable, else primary"""
+        if self.replica_available():
+            self.replica_reads += 1
+            return self.replica_factory()
+        if self.replica_factory is not None:
+            self.fallbacks += 1
+        self.primary_reads += 1
+        return self.primary_factory()
+
+    def stats(self):
+        """Routing metrics for monitoring"""
+        return {
+            'replica_configured': self.replica_factory is not None,
+            'replica_healthy': self._healthy,
+            'lag': self.lag,
+            'replica_reads': self.replica_reads,
+            'primary_reads': self.primary_reads,
+            'fallbacks': self.fallbacks
+        }
+
+
+read_router = ReadRouter(
+    SessionLocal,
+    ReplicaSessionLocal,
+    max_lag=float(os.environ.get("DB_REPLICA_MAX_LAG", "5")),
+    check_interval=float(os.environ.get("DB_REPLICA_CHECK_INTERVAL", "10"))
+)
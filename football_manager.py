@@ -13,8 +13,8 @@ logger = logging.getLogger(__name__)
 class FootballDataManager:
     """Manager for Football data using API-SPORTS"""
     
-    def __init__(self):
-        self.api_client = SportsAPIClient()
+    def __init__(self, api_client=None):
+        self.api_client = api_client or SportsAPIClient()
         self.leagues = {
             'SA': {'id': 135, 'name': '🇮🇹 Serie A'},
             'PL': {'id': 39, 'name': '🏴󠁧󠁢󠁥󠁮󠁧󠁿 Premier League'}, 
@@ -22,13 +22,13 @@ class FootballDataManager:
             'BL1': {'id': 78, 'name': '🇩🇪 Bundesliga'}
         }
     
-    def get_todays_matches(self):
+    async def get_todays_matches(self):
         """Get today's matches from API or simulation fallback"""
         if not self.api_client.api_key:
             return self._get_simulated_matches()
             
         try:
-            fixtures = self.api_client.get_football_fixtures()
+            fixtures = await self.api_client.get_football_fixtures()
             if not fixtures:
                 return self._get_simulated_matches()
             
@@ -50,14 +50,14 @@ class FootballDataManager:
             logger.error(f"Error fetching football matches: {e}")
             return self._get_simulated_matches()
 
-    def get_standings(self, league_code):
+    async def get_standings(self, league_code):
         """Get league standings from API or simulation fallback"""
         if league_code not in self.leagues or not self.api_client.api_key:
             return self._get_simulated_standings(league_code)
             
         try:
             league_id = self.leagues[league_code]['id']
-            data = self.api_client.get_football_standings(league_id)
+            data = await self.api_client.get_football_standings(league_id)
             
             if not data or not data[0].get('league', {}).get('standings'):
                 return self._get_simulated_standings(league_code)
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
-"""Initialize the database with sample data"""
-from models import init_db, SessionLocal, ValueBet
+"""Initialize the database with sample data
+    python init_database.py            migrate, then seed
+"""
+from models import SessionLocal, ValueBet
+from database import upsert_insert
+from migrate import upgrade
 from datetime import datetime, timedelta
 
+# Natural key of a published value bet
+VALUE_BET_KEY = ('match', 'bet_type', 'selection', 'bet_date')
+
 def create_sample_data():
-    """Create sample value bets"""
+    """Create sample value bets (idempotent - at most once per day)"""
     db = SessionLocal()
     
     # Sample value bets
@@ -33,19 +40,27 @@ def create_sample_data():
         }
     ]
     
-    for bet_data in sample_bets:
-        expires_at = datetime.utcnow() + timedelta(days=1)
-        bet = ValueBet(
+    now = datetime.utcnow()
+    rows = [
+        {
             **bet_data,
-            is_active=True,
-            expires_at=expires_at
-        )
-        db.add(bet)
+            'is_active': True,
+            'created_at': now,
+            'expires_at': now + timedelta(days=1),
+            'bet_date': now.date()
+        }
+        for bet_data in sample_bets
+    ]
     
+    # Rows already published today hit the natural key and are skipped
+    stmt = upsert_insert(db)(ValueBet).values(rows).on_conflict_do_nothing(
+        index_elements=[getattr(ValueBet, column) for column in VALUE_BET_KEY]
+    )
+    inserted = db.execute(stmt).rowcount
     db.commit()
     db.close()
-    print("✅ Sample data created")
+    print(f"✅ Sample data created ({inserted} new value bets)")
 
 if __name__ == "__main__":
-    init_db()
+    upgrade()
     create_sample_data()
\ No newline at end of file
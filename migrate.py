@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Migrate - Explicit schema migration step (run on deploy, not on every boot)
+    python migrate.py            upgrade to the latest revision
+    python migrate.py --check    exit 1 if the schema is behind
+The bot itself only compares alembic_version to the head revision at startup
+"""
+
+import os
+import sys
+import logging
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from models import Base, engine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Revision matching the schema that init_db() / create_all used to build
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = ("users", "predictions", "bets", "value_bets", "tennis_predictions",
+                   "basketball_predictions", "user_sport_stats", "system_logs")
+
+
+def alembic_config():
+    """Alembic Config that works from any working directory"""
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    # Leave logging to the host process (bot.py, init_database.py) when it has set it up
+    config.attributes["configure_logger"] = not logging.getLogger().handlers
+    return config
+
+
+def head_revision():
+    """Latest revision in migrations/versions (read from disk, no DB access)"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection):
+    """Revision recorded in alembic_version, or None for an unversioned database"""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def schema_status():
+    """(current, head) - a single SELECT on alembic_version"""
+    with engine.connect() as conn:
+        return current_revision(conn), head_revision()
+
+
+def stamp_existing_database():
+    """Adopt a database created by create_all: fill in missing baseline tables, stamp it"""
+    with engine.connect() as conn:
+        if current_revision(conn) is not None or not inspect(conn).has_table("users"):
+            return False
+        existing = set(inspect(conn).get_table_names())
+
+    # Tables added after the database was created (e.g. user_sport_stats) - new and empty
+    missing = [Base.metadata.tables[name] for name in BASELINE_TABLES if name not in existing]
+    if missing:
+        Base.metadata.create_all(bind=engine, tables=missing)
+        print(f"✅ Created missing tables: {[table.name for table in missing]}")
+
+    command.stamp(alembic_config(), BASELINE_REVISION)
+    print(f"✅ Existing database stamped at revision {BASELINE_REVISION}")
+    return True
+
+
+def upgrade():
+    """Bring the database to head and backfill derived tables"""
+    stamp_existing_database()
+    command.upgrade(alembic_config(), "head")
+
+    from database import DatabaseManager
+    with DatabaseManager() as db:
+        if db.ensure_sport_stats():
+            print("✅ Stats counters backfilled")
+
+    print(f"✅ Database schema at revision {head_revision()}")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        current, head = schema_status()
+        print(f"Schema revision: {current or 'none'} (head: {head})")
+        sys.exit(0 if current == head else 1)
+    upgrade()
@@ -0,0 +1,58 @@
+"""Alembic environment - runs migrations against models.Base on DATABASE_URL"""
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+from alembic import context
+
+from models import Base, DATABASE_URL
+
+config = context.config
+# migrate.alembic_config() turns this off when the host process already configured logging,
+# since fileConfig would reset the root logger and its handlers
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names):
+    """Monthly partitions are managed by partitions.py, not by autogenerate"""
+    if type_ == "table" and name.startswith("prediction_facts_"):
+        return False
+    return True
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations on a dedicated connection (not the bot's pool)"""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            # One transaction per revision, so autocommit_block() (CREATE INDEX CONCURRENTLY)
+            # only has to step out of its own revision's transaction
+            transaction_per_migration=True,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
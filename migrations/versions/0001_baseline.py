@@ -0,0 +1,156 @@
+"""Baseline schema (tables previously created by init_db / create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('telegram_id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=100)),
+        sa.Column('first_name', sa.String(length=100)),
+        sa.Column('last_name', sa.String(length=100)),
+        sa.Column('is_active', sa.Boolean()),
+        sa.Column('is_subscribed', sa.Boolean()),
+        sa.Column('is_premium', sa.Boolean()),
+        sa.Column('subscription_ends', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('last_seen', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_telegram_id', 'users', ['telegram_id'], unique=True)
+
+    op.create_table(
+        'predictions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('home_team', sa.String(length=100)),
+        sa.Column('away_team', sa.String(length=100)),
+        sa.Column('league', sa.String(length=50)),
+        sa.Column('predicted_result', sa.String(length=1)),
+        sa.Column('actual_result', sa.String(length=1), nullable=True),
+        sa.Column('home_prob', sa.Float()),
+        sa.Column('draw_prob', sa.Float()),
+        sa.Column('away_prob', sa.Float()),
+        sa.Column('confidence', sa.Float()),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_predictions_id', 'predictions', ['id'])
+
+    op.create_table(
+        'bets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('match', sa.String(length=200)),
+        sa.Column('bet_type', sa.String(length=50)),
+        sa.Column('selection', sa.String(length=50)),
+        sa.Column('odds', sa.Float()),
+        sa.Column('stake', sa.Float()),
+        sa.Column('result', sa.String(length=10), nullable=True),
+        sa.Column('profit_loss', sa.Float(), nullable=True),
+        sa.Column('placed_at', sa.DateTime()),
+        sa.Column('settled_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bets_id', 'bets', ['id'])
+
+    op.create_table(
+        'value_bets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('match', sa.String(length=200)),
+        sa.Column('league', sa.String(length=50)),
+        sa.Column('bet_type', sa.String(length=50)),
+        sa.Column('selection', sa.String(length=50)),
+        sa.Column('odds', sa.Float()),
+        sa.Column('probability', sa.Float()),
+        sa.Column('edge', sa.Float()),
+        sa.Column('confidence', sa.Float()),
+        sa.Column('recommended_stake', sa.String(length=20)),
+        sa.Column('is_active', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('expires_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_value_bets_id', 'value_bets', ['id'])
+
+    op.create_table(
+        'tennis_predictions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('player1', sa.String(length=100)),
+        sa.Column('player2', sa.String(length=100)),
+        sa.Column('tournament', sa.String(length=100)),
+        sa.Column('surface', sa.String(length=20)),
+        sa.Column('predicted_winner', sa.String(length=100)),
+        sa.Column('actual_winner', sa.String(length=100), nullable=True),
+        sa.Column('player1_prob', sa.Float()),
+        sa.Column('player2_prob', sa.Float()),
+        sa.Column('confidence', sa.Float()),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tennis_predictions_id', 'tennis_predictions', ['id'])
+
+    op.create_table(
+        'basketball_predictions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('home_team', sa.String(length=100)),
+        sa.Column('away_team', sa.String(length=100)),
+        sa.Column('league', sa.String(length=100)),
+        sa.Column('predicted_winner', sa.String(length=100)),
+        sa.Column('actual_winner', sa.String(length=100), nullable=True),
+        sa.Column('home_prob', sa.Float()),
+        sa.Column('away_prob', sa.Float()),
+        sa.Column('confidence', sa.Float()),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_basketball_predictions_id', 'basketball_predictions', ['id'])
+
+    op.create_table(
+        'user_sport_stats',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('sport', sa.String(length=20), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('pending', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('user_id', 'sport')
+    )
+
+    op.create_table(
+        'system_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('level', sa.String(length=20)),
+        sa.Column('message', sa.Text()),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_system_logs_id', 'system_logs', ['id'])
+
+
+def downgrade():
+    for table in ('system_logs', 'user_sport_stats', 'basketball_predictions', 'tennis_predictions',
+                  'value_bets', 'bets', 'predictions', 'users'):
+        op.drop_table(table)
@@ -0,0 +1,54 @@
+"""Composite and partial indexes for the prediction-history access paths
+
+Stats and history queries filter on user_id and read the newest rows first
+(ORDER BY created_at DESC LIMIT 5); settlement scans pending rows. Indexes are
+built with CREATE INDEX CONCURRENTLY on PostgreSQL so the tables stay writable.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+PREDICTION_TABLES = ('predictions', 'tennis_predictions', 'basketball_predictions')
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table in PREDICTION_TABLES:
+            # if_not_exists: databases created by create_all already have them
+            op.create_index(
+                f'ix_{table}_user_created', table,
+                ['user_id', sa.text('created_at DESC')],
+                postgresql_concurrently=True, if_not_exists=True
+            )
+            op.create_index(
+                f'ix_{table}_pending', table, ['created_at'],
+                postgresql_where=sa.text('is_correct IS NULL'),
+                sqlite_where=sa.text('is_correct IS NULL'),
+                postgresql_concurrently=True, if_not_exists=True
+            )
+            op.create_index(
+                f'ix_{table}_user_correct', table, ['user_id'],
+                postgresql_where=sa.text('is_correct = true'),
+                sqlite_where=sa.text('is_correct = 1'),
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in PREDICTION_TABLES:
+            for suffix in ('user_correct', 'pending', 'user_created'):
+                op.drop_index(f'ix_{table}_{suffix}', table_name=table,
+                              postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""Natural key on value_bets (match, bet_type, selection, bet_date)
+
+Sample data used to be re-inserted on every start. Backfills bet_date from
+created_at, removes the duplicates (keeping the oldest row) and adds the
+unique index that seeding upserts against.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('value_bets', sa.Column('bet_date', sa.Date(), nullable=True))
+    op.execute("UPDATE value_bets SET bet_date = DATE(created_at) WHERE bet_date IS NULL")
+    op.execute("""
+        DELETE FROM value_bets
+        WHERE EXISTS (
+            SELECT 1 FROM value_bets AS older
+            WHERE older."match" = value_bets."match"
+              AND older.bet_type = value_bets.bet_type
+              AND older.selection = value_bets.selection
+              AND older.bet_date = value_bets.bet_date
+              AND older.id < value_bets.id
+        )
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_value_bets_natural_key', 'value_bets',
+            ['match', 'bet_type', 'selection', 'bet_date'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_value_bets_natural_key', table_name='value_bets',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('value_bets', 'bet_date')
@@ -0,0 +1,104 @@
+"""Unified prediction_facts table, monthly range partitions, backfill
+
+One row per prediction across football, tennis and basketball, keyed by
+(sport, id, created_at) where id is the row id in the sport's table. On
+PostgreSQL the table is partitioned by month on created_at; a DEFAULT
+partition catches anything outside the pre-created months.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 10:30:00
+
+"""
+import os
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# Same setting as partitions.py, so the daily job continues where the migration stopped
+MONTHS_AHEAD = int(os.environ.get("PREDICTION_PARTITIONS_AHEAD", "2"))
+
+# sport -> (table, home, away, league, predicted, actual, home_prob, draw_prob, away_prob)
+SOURCES = {
+    'football': ('predictions', 'home_team', 'away_team', 'league', 'predicted_result',
+                 'actual_result', 'home_prob', 'draw_prob', 'away_prob'),
+    'tennis': ('tennis_predictions', 'player1', 'player2', 'tournament', 'predicted_winner',
+               'actual_winner', 'player1_prob', 'NULL', 'player2_prob'),
+    'basketball': ('basketball_predictions', 'home_team', 'away_team', 'league', 'predicted_winner',
+                   'actual_winner', 'home_prob', 'NULL', 'away_prob'),
+}
+
+
+def _add_months(month, months):
+    years, index = divmod(month.month - 1 + months, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+
+def _create_partitions(bind):
+    oldest = bind.execute(sa.text(
+        "SELECT MIN(created_at) FROM (" +
+        " UNION ALL ".join(f"SELECT MIN(created_at) AS created_at FROM {source[0]}" for source in SOURCES.values()) +
+        ") AS oldest"
+    )).scalar() or datetime.utcnow()
+
+    month = datetime(oldest.year, oldest.month, 1)
+    last = _add_months(datetime(datetime.utcnow().year, datetime.utcnow().month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE prediction_facts_{month:%Y%m} PARTITION OF prediction_facts "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE prediction_facts_default PARTITION OF prediction_facts DEFAULT")
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    op.create_table(
+        'prediction_facts',
+        sa.Column('sport', sa.String(length=20), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id')),
+        sa.Column('home', sa.String(length=100)),
+        sa.Column('away', sa.String(length=100)),
+        sa.Column('league', sa.String(length=100)),
+        sa.Column('predicted', sa.String(length=100)),
+        sa.Column('actual', sa.String(length=100), nullable=True),
+        sa.Column('home_prob', sa.Float()),
+        sa.Column('draw_prob', sa.Float(), nullable=True),
+        sa.Column('away_prob', sa.Float()),
+        sa.Column('confidence', sa.Float()),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('sport', 'id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
+    )
+    if bind.dialect.name == 'postgresql':
+        _create_partitions(bind)
+
+    for sport, (table, home, away, league, predicted, actual, home_prob, draw_prob, away_prob) in SOURCES.items():
+        op.execute(f"""
+            INSERT INTO prediction_facts (sport, id, created_at, user_id, home, away, league, predicted,
+                                          actual, home_prob, draw_prob, away_prob, confidence, is_correct)
+            SELECT '{sport}', id, COALESCE(created_at, CURRENT_TIMESTAMP), user_id, {home}, {away}, {league},
+                   {predicted}, {actual}, {home_prob}, {draw_prob}, {away_prob}, confidence, is_correct
+            FROM {table}
+        """)
+
+    # Built after the backfill; on PostgreSQL each partition gets its own copy
+    op.create_index('ix_prediction_facts_user_created', 'prediction_facts',
+                    ['user_id', sa.text('created_at DESC')])
+    op.create_index('ix_prediction_facts_sport_created', 'prediction_facts', ['sport', 'created_at'])
+
+
+def downgrade():
+    # Dropping the parent drops its partitions
+    op.drop_table('prediction_facts')
@@ -0,0 +1,37 @@
+"""Partial index for today's active value bets
+
+Serves get_todays_value_bets (is_active, expires_at window, ORDER BY edge DESC).
+Only active rows are indexed, so the index stays small while the expiry
+sweeper deactivates old bets.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_value_bets_active_expires', 'value_bets',
+            ['expires_at', sa.text('edge DESC')],
+            postgresql_where=sa.text('is_active = true'),
+            sqlite_where=sa.text('is_active = 1'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_value_bets_active_expires', table_name='value_bets',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,51 @@
+"""Precomputed accuracy leaderboard, backfilled from user_sport_stats
+
+One row per (sport, user) with at least LEADERBOARD_MIN_SETTLED settled
+predictions. settle_prediction refreshes the settling user's row, so
+/leaderboard reads the top-N and the caller's rank off ix_leaderboard_rank
+instead of aggregating the prediction tables.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 12:00:00
+
+"""
+import os
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+MIN_SETTLED = int(os.environ.get("LEADERBOARD_MIN_SETTLED", "5"))
+
+
+def upgrade():
+    op.create_table(
+        'leaderboard_entries',
+        sa.Column('sport', sa.String(length=20), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('settled', sa.Integer(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('accuracy', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('sport', 'user_id')
+    )
+
+    op.execute(f"""
+        INSERT INTO leaderboard_entries (sport, user_id, settled, correct, accuracy, updated_at)
+        SELECT sport, user_id, total - pending, correct, correct * 100.0 / (total - pending), CURRENT_TIMESTAMP
+        FROM user_sport_stats
+        WHERE total - pending >= {max(MIN_SETTLED, 1)}
+    """)
+
+    op.create_index('ix_leaderboard_rank', 'leaderboard_entries',
+                    ['sport', sa.text('accuracy DESC'), sa.text('correct DESC'), 'user_id'])
+
+
+def downgrade():
+    op.drop_table('leaderboard_entries')
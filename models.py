@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
@@ -14,10 +15,46 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Shared connection pool - sessions borrow connections instead of opening new ones
+engine_options = {
+    "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+}
+if not DATABASE_URL.startswith("sqlite"):
+    engine_options.update(
+        pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", "30"))
+    )
+
+engine = create_engine(DATABASE_URL, **engine_options)
+# expire_on_commit=False keeps returned rows readable after the session closes
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Optional read replica for read-only paths (see db_router.py)
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith("postgres://"):
+    DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace("postgres://", "postgresql://", 1)
+
+replica_engine = create_engine(DATABASE_REPLICA_URL, **engine_options) if DATABASE_REPLICA_URL else None
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine
+) if replica_engine else None
 Base = declarative_base()
 
+def prediction_history_indexes(table, user_id, is_correct, created_at):
+    """Indexes shared by the prediction tables (built concurrently by migration 0002)"""
+    return (
+        # Per-user history, newest first
+        Index(f"ix_{table}_user_created", user_id, created_at.desc()),
+        # Pending rows awaiting settlement
+        Index(f"ix_{table}_pending", created_at,
+              postgresql_where=is_correct.is_(None), sqlite_where=is_correct.is_(None)),
+        # Correct predictions per user
+        Index(f"ix_{table}_user_correct", user_id,
+              postgresql_where=is_correct == True, sqlite_where=is_correct == True),
+    )
+
 class User(Base):
     """User table"""
     __tablename__ = "users"
@@ -60,6 +97,8 @@ class Prediction(Base):
     
     # Relationships
     user = relationship("User", back_populates="predictions")
+    
+    __table_args__ = prediction_history_indexes("predictions", user_id, is_correct, created_at)
 
 class Bet(Base):
     """Bet tracking"""
@@ -97,6 +136,15 @@ class ValueBet(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime)
+    bet_date = Column(Date, default=lambda: datetime.utcnow().date())  # day the bet was published
+    
+    # Natural key - the same bet is published at most once per day
+    __table_args__ = (
+        Index("uq_value_bets_natural_key", "match", "bet_type", "selection", "bet_date", unique=True),
+        # Today's active bets by edge - expired rows leave the index once the sweeper deactivates them
+        Index("ix_value_bets_active_expires", expires_at, edge.desc(),
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
 
 class TennisPrediction(Base):
     """Tennis prediction history"""
@@ -118,6 +166,8 @@ class TennisPrediction(Base):
     
     # Relationships
     user = relationship("User", back_populates="tennis_predictions")
+    
+    __table_args__ = prediction_history_indexes("tennis_predictions", user_id, is_correct, created_at)
 
 
 
@@ -140,6 +190,65 @@ class BasketballPrediction(Base):
     
     # Relationships
     user = relationship("User", back_populates="basketball_predictions")
+    
+    __table_args__ = prediction_history_indexes("basketball_predictions", user_id, is_correct, created_at)
+
+class PredictionFact(Base):
+    """Unified prediction history across sports, dual-written alongside the per-sport tables
+    
+    Range-partitioned by month on created_at in PostgreSQL (see partitions.py).
+    id is the row id in the sport's own table. Tennis players map to home/away
+    and the tournament to league.
+    """
+    __tablename__ = "prediction_facts"
+    
+    sport = Column(String(20), primary_key=True)  # football, tennis, basketball
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # partition key
+    user_id = Column(Integer, ForeignKey("users.id"))
+    home = Column(String(100))
+    away = Column(String(100))
+    league = Column(String(100))
+    predicted = Column(String(100))  # 1/X/2 for football, winner otherwise
+    actual = Column(String(100), nullable=True)
+    home_prob = Column(Float)
+    draw_prob = Column(Float, nullable=True)
+    away_prob = Column(Float)
+    confidence = Column(Float)
+    is_correct = Column(Boolean, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_prediction_facts_user_created", user_id, created_at.desc()),
+        Index("ix_prediction_facts_sport_created", sport, created_at),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class UserSportStats(Base):
+    """Per-user prediction counters, kept in step with the prediction tables"""
+    __tablename__ = "user_sport_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sport = Column(String(20), primary_key=True)  # football, tennis, basketball
+    total = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+    pending = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class LeaderboardEntry(Base):
+    """Accuracy leaderboard per sport, refreshed from user_sport_stats when predictions settle"""
+    __tablename__ = "leaderboard_entries"
+    
+    sport = Column(String(20), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    settled = Column(Integer, nullable=False)
+    correct = Column(Integer, nullable=False)
+    accuracy = Column(Float, nullable=False)  # correct / settled, in %
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Top-N and rank counts are range scans on this index
+        Index("ix_leaderboard_rank", sport, accuracy.desc(), correct.desc(), user_id),
+    )
 
 class SystemLog(Base):
     """System logs"""
@@ -153,13 +262,26 @@ class SystemLog(Base):
 
 # Create tables
 def init_db():
-    """Initialize database tables"""
+    """Create tables directly from the models (scratch databases only - deployments use migrate.py)"""
     try:
         Base.metadata.create_all(bind=engine)
         print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Database error: {e}")
 
+@contextmanager
+def session_scope():
+    """Pooled session for a unit of work - commit on success, rollback on error"""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
 # Database session dependency
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Partitions - Monthly range partitions for prediction_facts (PostgreSQL)
+A daily job creates upcoming months ahead of time; months past the retention
+window can be detached without rewriting or locking the rest of the table.
+On other databases the table is unpartitioned and these helpers do nothing.
+"""
+
+import os
+import logging
+from datetime import datetime
+from sqlalchemy import text
+from telegram.ext import ContextTypes
+from models import engine
+from workers import db_executor
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "prediction_facts"
+MONTHS_AHEAD = int(os.environ.get("PREDICTION_PARTITIONS_AHEAD", "2"))
+# 0 keeps every partition attached
+RETENTION_MONTHS = int(os.environ.get("PREDICTION_PARTITION_RETENTION_MONTHS", "0"))
+MAINTENANCE_INTERVAL = 24 * 3600
+
+
+def month_start(day):
+    return datetime(day.year, day.month, 1)
+
+
+def add_months(month, months):
+    years, index = divmod(month.month - 1 + months, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_{month:%Y%m}"
+
+
+def is_partitioned(conn):
+    """True if prediction_facts is a partitioned PostgreSQL table"""
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": PARENT_TABLE}).first() is not None
+
+
+def create_partition(conn, month):
+    """Create the partition holding [month, next month) if it is missing"""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    ))
+
+
+def list_partitions(conn):
+    """Monthly partitions currently attached, oldest first, as (name, month)"""
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+    """), {"table": PARENT_TABLE})
+    partitions = []
+    for (name,) in rows:
+        try:
+            partitions.append((name, datetime.strptime(name[len(PARENT_TABLE) + 1:], "%Y%m")))
+        except ValueError:
+            continue  # default partition
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(months_ahead=MONTHS_AHEAD):
+    """Create partitions for the current month and the next months_ahead"""
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return []
+        existing = {name for name, _ in list_partitions(conn)}
+        this_month = month_start(datetime.utcnow())
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            if partition_name(month) not in existing:
+                create_partition(conn, month)
+                created.append(partition_name(month))
+    if created:
+        logger.info(f"✅ Created prediction partitions: {created}")
+    return created
+
+
+def detach_partitions(retention_months=RETENTION_MONTHS):
+    """Detach monthly partitions older than the retention window (tables are kept, not dropped)"""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(datetime.utcnow()), -retention_months)
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return []
+        detached = []
+        for name, month in list_partitions(conn):
+            if month >= cutoff:
+                break
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+    if detached:
+        logger.info(f"✅ Detached prediction partitions: {detached}")
+    return detached
+
+
+async def partition_maintenance_job(context: ContextTypes.DEFAULT_TYPE):
+    """Keep upcoming partitions in place and detach expired ones"""
+    try:
+        await db_executor.run(ensure_partitions)
+        await db_executor.run(detach_partitions)
+    except Exception as e:
+        logger.error(f"❌ Partition maintenance failed: {e}")
+
+
+def register_partition_jobs(job_queue):
+    """Schedule daily partition maintenance"""
+    job_queue.run_repeating(partition_maintenance_job, interval=MAINTENANCE_INTERVAL, first=60,
+                            name="prediction_partitions")
+    logger.info("✅ Partition maintenance scheduled (daily)")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Prediction Writer - Write-behind persistence for user predictions
+Handlers queue predictions and reply immediately; rows are flushed in bulk
+every N rows or M milliseconds, retried on failure and spooled to disk
+if the database stays unavailable. Rows the database rejects outright go to
+a dead-letter file and are never replayed.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy.exc import DBAPIError, OperationalError, InterfaceError, TimeoutError as PoolTimeout
+from database import DatabaseManager, PREDICTION_MODELS
+from workers import db_executor
+
+logger = logging.getLogger(__name__)
+
+
+def is_connection_error(error):
+    """True if the database could not be reached (retry later), False if it rejected the rows"""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return isinstance(error, (OSError, PoolTimeout))
+
+
+class PredictionWriter:
+    """Batches prediction inserts off the request path"""
+
+    def __init__(self, batch_size=50, flush_interval_ms=500, max_pending=10000,
+                 max_retries=5, spool_path=None, dead_letter_path=None, executor=db_executor):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.spool_path = spool_path
+        self.dead_letter_path = dead_letter_path
+        self.executor = executor
+
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._retry_at = 0.0
+        self._consecutive_failures = 0
+        self._spool_pending = False  # rows waiting on disk for the next successful flush
+
+        # Counters
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.spooled = 0
+        self.dead_lettered = 0
+        self.dropped = 0
+
+    def submit(self, sport, telegram_id, **fields):
+        """Queue a prediction ('football', 'tennis' or 'basketball') - False if the queue is full"""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            logger.error(f"❌ Prediction queue full - dropped {sport} prediction for user {telegram_id}")
+            return False
+
+        # Fit text to the column sizes, so a long team or player name can't poison a batch
+        columns = PREDICTION_MODELS[sport].__table__.columns
+        for key, value in fields.items():
+            length = getattr(columns[key].type, 'length', None)
+            if isinstance(value, str) and length and len(value) > length:
+                fields[key] = value[:length]
+
+        self._pending.append({
+            'sport': sport,
+            'telegram_id': telegram_id,
+            'created_at': datetime.utcnow(),
+            **fields
+        })
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def start(self):
+        """Replay spooled rows and start the flush loop"""
+        self._load_spool()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"✅ Prediction writer started (batch {self.batch_size}, every {int(self.flush_interval * 1000)}ms)")
+
+    async def stop(self):
+        """Stop the flush loop and drain what is left"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Final drain - ignore backoff, spool anything the DB won't take
+        self._retry_at = 0.0
+        while self._pending:
+            if not await self._flush_batch():
+                self._spool(self._pending)
+                self._pending = []
+        logger.info(f"✅ Prediction writer drained ({self.flushed} saved, {self.spooled} spooled)")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write all pending predictions, one batch at a time"""
+        while self._pending and time.monotonic() >= self._retry_at:
+            if not await self._flush_batch():
+                return
+
+    async def _flush_batch(self):
+        batch = self._pending[:self.batch_size]
+        try:
+            await self.executor.run(self._write, batch)
+        except Exception as e:
+            if not is_connection_error(e):
+                # The database refused the data, not the connection - find the bad rows
+                return await self._write_rows(batch, e)
+            self._batch_failed(batch, e)
+            return False
+
+        del self._pending[:len(batch)]
+        self.flushed += len(batch)
+        self._batch_written()
+        return True
+
+    async def _write_rows(self, batch, error):
+        """Write a rejected batch one row at a time, dead-lettering the rows that still fail"""
+        logger.warning(f"⚠️ Prediction batch rejected, writing {len(batch)} rows one by one: {error}")
+        for done, row in enumerate(batch):
+            try:
+                await self.executor.run(self._write, [row])
+            except Exception as e:
+                if is_connection_error(e):
+                    self._batch_failed(batch[done:], e)
+                    return False
+                self._dead_letter(row, e)
+            else:
+                self.flushed += 1
+            del self._pending[0]
+
+        self._batch_written()
+        return True
+
+    def _batch_failed(self, batch, error):
+        """Back off after a connection failure; spool the batch once retries run out"""
+        self.failures += 1
+        self._consecutive_failures += 1
+        logger.error(f"❌ Prediction batch failed ({self._consecutive_failures}/{self.max_retries}): {error}")
+
+        if self._consecutive_failures >= self.max_retries:
+            # Database still down - move the batch to disk so memory doesn't grow
+            self._spool(batch)
+            del self._pending[:len(batch)]
+            self._consecutive_failures = 0
+        self._retry_at = time.monotonic() + min(30, 2 ** self._consecutive_failures)
+
+    def _batch_written(self):
+        self.batches += 1
+        self._consecutive_failures = 0
+        if self._spool_pending:
+            # Database is back - replay what was spooled while it was down
+            self._load_spool()
+
+    @staticmethod
+    def _write(batch):
+        with DatabaseManager() as db:
+            db.bulk_save_predictions(batch)
+
+    def _spool(self, rows):
+        """Append rows to the spool file for a later retry"""
+        if not self.spool_path:
+            self.dropped += len(rows)
+            logger.error(f"❌ Dropped {len(rows)} predictions (no spool file configured)")
+            return
+        try:
+            with open(self.spool_path, 'a') as f:
+                for row in rows:
+                    f.write(json.dumps({**row, 'created_at': row['created_at'].isoformat()}) + "\n")
+            self.spooled += len(rows)
+            self._spool_pending = True
+            logger.warning(f"⚠️ Spooled {len(rows)} predictions to {self.spool_path}")
+        except OSError as e:
+            self.dropped += len(rows)
+            logger.error(f"❌ Could not spool predictions: {e}")
+
+    def _dead_letter(self, row, error):
+        """Keep a row the database refuses for inspection - it is never replayed"""
+        self.dead_lettered += 1
+        logger.error(f"❌ {row['sport'].title()} prediction for user {row['telegram_id']} rejected: {error}")
+        if not self.dead_letter_path:
+            return
+        try:
+            with open(self.dead_letter_path, 'a') as f:
+                f.write(json.dumps({**row, 'created_at': row['created_at'].isoformat(),
+                                    'error': str(error)[:500]}) + "\n")
+        except OSError as e:
+            logger.error(f"❌ Could not write prediction dead letter: {e}")
+
+    def _load_spool(self):
+        """Move spooled rows back into the queue"""
+        self._spool_pending = False
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        try:
+            with open(self.spool_path) as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            os.remove(self.spool_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Could not read prediction spool: {e}")
+            return
+
+        for row in rows:
+            row['created_at'] = datetime.fromisoformat(row['created_at'])
+        self._pending[:0] = rows
+        logger.info(f"✅ Re-queued {len(rows)} spooled predictions")
+
+    def stats(self):
+        """Queue metrics for monitoring"""
+        return {
+            'pending': len(self._pending),
+            'flushed': self.flushed,
+            'batches': self.batches,
+            'failures': self.failures,
+            'spooled': self.spooled,
+            'dead_lettered': self.dead_lettered,
+            'dropped': self.dropped
+        }
+
+
+prediction_writer = PredictionWriter(
+    batch_size=int(os.environ.get("PREDICTION_BATCH_SIZE", "50")),
+    flush_interval_ms=int(os.environ.get("PREDICTION_FLUSH_MS", "500")),
+    spool_path=os.environ.get("PREDICTION_SPOOL_PATH", "pending_predictions.jsonl"),
+    dead_letter_path=os.environ.get("PREDICTION_DEAD_LETTER_PATH", "rejected_predictions.jsonl")
+)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Prefetch Jobs - Keep the API cache warm for the data users ask for most
+Runs on the python-telegram-bot JobQueue so handlers never wait on API-SPORTS
+"""
+
+import os
+import logging
+from telegram.ext import ContextTypes
+
+logger = logging.getLogger(__name__)
+
+# Refresh just before the matching cache TTLs in SportsAPIClient expire
+FIXTURES_INTERVAL = int(os.environ.get("PREFETCH_FIXTURES_INTERVAL", "540"))   # fixtures/games TTL: 10 min
+TABLES_INTERVAL = int(os.environ.get("PREFETCH_TABLES_INTERVAL", "18000"))     # standings/rankings TTL: 6 h
+
+# Background refreshes stop when less than this share of the daily quota is left,
+# keeping the rest for user-triggered requests
+MIN_BUDGET_SHARE = float(os.environ.get("PREFETCH_MIN_BUDGET_SHARE", "0.3"))
+
+
+def _has_budget(api_client, url):
+    """True if the host has enough daily quota left for background work"""
+    quota = api_client.quotas[url]
+    if quota.has_budget(reserve=int(quota.daily_limit * MIN_BUDGET_SHARE)):
+        return True
+    logger.info(f"⏭️ Skipping {quota.name} prefetch - saving quota for users")
+    return False
+
+
+async def prefetch_fixtures_job(context: ContextTypes.DEFAULT_TYPE):
+    """Refresh today's football fixtures, tennis matches and basketball games"""
+    api_client = context.job.data['api_client']
+
+    if _has_budget(api_client, api_client.football_url):
+        await api_client.get_football_fixtures(refresh=True)
+    if _has_budget(api_client, api_client.tennis_url):
+        await api_client.get_tennis_matches_today(refresh=True)
+    if _has_budget(api_client, api_client.basketball_url):
+        await api_client.get_basketball_games_today(refresh=True)
+
+    logger.info("✅ Prefetched today's fixtures")
+
+
+async def prefetch_tables_job(context: ContextTypes.DEFAULT_TYPE):
+    """Refresh football standings and ATP/WTA rankings"""
+    api_client = context.job.data['api_client']
+    leagues = context.job.data['leagues']
+
+    for league in leagues.values():
+        if not _has_budget(api_client, api_client.football_url):
+            break
+        await api_client.get_football_standings(league['id'], refresh=True)
+
+    for tour in ('atp', 'wta'):
+        if not _has_budget(api_client, api_client.tennis_url):
+            break
+        await api_client.get_tennis_rankings(tour, refresh=True)
+
+    logger.info("✅ Prefetched standings and rankings")
+
+
+def register_prefetch_jobs(job_queue, api_client, leagues):
+    """Schedule the prefetch jobs (no-op in simulation mode)"""
+    if not api_client.api_key:
+        logger.info("⏭️ Prefetch disabled - no SPORTS_API_KEY")
+        return
+
+    data = {'api_client': api_client, 'leagues': leagues}
+    job_queue.run_repeating(prefetch_fixtures_job, interval=FIXTURES_INTERVAL, first=5,
+                            data=data, name="prefetch_fixtures")
+    job_queue.run_repeating(prefetch_tables_job, interval=TABLES_INTERVAL, first=15,
+                            data=data, name="prefetch_tables")
+    logger.info(f"✅ Prefetch jobs scheduled (fixtures every {FIXTURES_INTERVAL}s, tables every {TABLES_INTERVAL}s)")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Token bucket and daily budget tracking for API-SPORTS
+API-SPORTS enforces a per-minute and a per-day request limit per sport API
+"""
+
+import time
+from datetime import datetime
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take one token if available"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def available(self):
+        """Whole tokens currently available"""
+        self._refill()
+        return int(self.tokens)
+
+    def set_rate(self, rate_per_minute):
+        """Adopt the per-minute limit reported by the API"""
+        self._refill()
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = min(self.tokens, self.capacity)
+
+    def sync(self, remaining):
+        """Never hold more tokens than the API says are left"""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class HostQuota:
+    """Per-host limiter and daily budget tracker"""
+
+    def __init__(self, name, per_minute=10, per_day=100, reserve=5):
+        self.name = name
+        self.bucket = TokenBucket(per_minute)
+        self.daily_limit = per_day
+        self.daily_remaining = per_day
+        self.reserve = reserve
+        self.day = datetime.utcnow().date()  # API-SPORTS resets quotas at 00:00 UTC
+
+        # Counters
+        self.requests_made = 0
+        self.throttled = 0
+        self.low_budget = False
+
+    def _roll_day(self):
+        today = datetime.utcnow().date()
+        if today != self.day:
+            self.day = today
+            self.daily_remaining = self.daily_limit
+            self.low_budget = False
+
+    def has_budget(self, reserve=None):
+        """True while the daily budget is above the reserve"""
+        self._roll_day()
+        reserve = self.reserve if reserve is None else reserve
+        return self.daily_remaining > reserve
+
+    def try_acquire(self, reserve=None):
+        """Reserve one request, or return False when the budget is low"""
+        if not self.has_budget(reserve) or not self.bucket.try_acquire():
+            self.throttled += 1
+            return False
+
+        self.requests_made += 1
+        self.daily_remaining -= 1
+        self.low_budget = False
+        return True
+
+    def update_from_headers(self, headers):
+        """Sync limits with the rate-limit headers of a response"""
+        self._roll_day()
+
+        # Per-day quota
+        daily_limit = _int_header(headers, "x-ratelimit-requests-limit")
+        daily_remaining = _int_header(headers, "x-ratelimit-requests-remaining")
+        if daily_limit is not None:
+            self.daily_limit = daily_limit
+        if daily_remaining is not None:
+            self.daily_remaining = daily_remaining
+
+        # Per-minute quota
+        minute_limit = _int_header(headers, "x-ratelimit-limit")
+        minute_remaining = _int_header(headers, "x-ratelimit-remaining")
+        if minute_limit is not None and minute_limit != self.bucket.capacity:
+            self.bucket.set_rate(minute_limit)
+        if minute_remaining is not None:
+            self.bucket.sync(minute_remaining)
+
+    def exhaust_minute(self):
+        """Drain the bucket after a 429 from the API"""
+        self.bucket.sync(0)
+
+    def status(self):
+        """Quota snapshot for monitoring"""
+        self._roll_day()
+        return {
+            'name': self.name,
+            'daily_remaining': self.daily_remaining,
+            'daily_limit': self.daily_limit,
+            'minute_remaining': self.bucket.available(),
+            'minute_limit': int(self.bucket.capacity),
+            'requests_made': self.requests_made,
+            'throttled': self.throttled
+        }
+
+
+def _int_header(headers, name):
+    """Parse an integer header, None if missing or malformed"""
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Retention - Archive and prune old system_logs and prediction rows
+Rows past their retention age are appended to gzip JSONL files in ARCHIVE_DIR,
+then deleted in bounded batches so no run holds long locks. Expired value bets
+are deactivated by a more frequent sweep.
+    python retention.py      run once and print the report
+"""
+
+import os
+import gzip
+import json
+import logging
+from datetime import datetime, date, timedelta
+from telegram.ext import ContextTypes
+from models import session_scope, SystemLog, PredictionFact
+from database import DatabaseManager, PREDICTION_MODELS
+from workers import db_executor
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive")
+LOG_RETENTION_DAYS = int(os.environ.get("LOG_RETENTION_DAYS", "30"))
+# Opt-in: 0 keeps predictions forever (user_sport_stats keeps lifetime totals either way)
+PREDICTION_RETENTION_DAYS = int(os.environ.get("PREDICTION_RETENTION_DAYS", "0"))
+BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", "1000"))
+MAX_BATCHES = int(os.environ.get("RETENTION_MAX_BATCHES", "100"))  # per table, per run
+RETENTION_INTERVAL = 24 * 3600
+VALUE_BET_SWEEP_INTERVAL = int(os.environ.get("VALUE_BET_SWEEP_INTERVAL", "3600"))
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive {type(value).__name__}")
+
+
+def archive_table(model, cutoff, *filters, on_delete=None):
+    """Move rows older than cutoff to ARCHIVE_DIR/<table>-<day>.jsonl.gz, one batch per transaction
+
+    Each batch is written to the archive before its rows are deleted; a failed
+    commit can archive a batch twice but never loses it.
+    """
+    table = model.__tablename__
+    path = os.path.join(ARCHIVE_DIR, f"{table}-{datetime.utcnow():%Y%m%d}.jsonl.gz")
+    report = {'table': table, 'rows': 0, 'bytes': 0, 'archive_bytes': 0}
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+
+    for _ in range(MAX_BATCHES):
+        with session_scope() as db:
+            rows = db.query(model).filter(model.created_at < cutoff, *filters) \
+                .order_by(model.id).limit(BATCH_SIZE).all()
+            if not rows:
+                break
+
+            data = "".join(
+                json.dumps({column.key: getattr(row, column.key) for column in model.__table__.columns},
+                           default=_json_default) + "\n"
+                for row in rows
+            ).encode()
+            size_before = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(path, 'ab') as f:
+                f.write(data)
+
+            ids = [row.id for row in rows]
+            if on_delete:
+                on_delete(db, ids)
+            db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+
+        report['rows'] += len(rows)
+        report['bytes'] += len(data)
+        report['archive_bytes'] += os.path.getsize(path) - size_before
+        if len(rows) < BATCH_SIZE:
+            break
+
+    if report['rows']:
+        logger.info(f"🗄️ Archived {report['rows']} {table} rows ({report['bytes']} bytes -> {report['archive_bytes']} gzipped)")
+    return report
+
+
+def run_retention():
+    """Apply every retention policy once - returns one report per table"""
+    now = datetime.utcnow()
+    reports = []
+
+    if LOG_RETENTION_DAYS > 0:
+        reports.append(archive_table(SystemLog, now - timedelta(days=LOG_RETENTION_DAYS)))
+
+    if PREDICTION_RETENTION_DAYS > 0:
+        cutoff = now - timedelta(days=PREDICTION_RETENTION_DAYS)
+        for sport, model in PREDICTION_MODELS.items():
+            def delete_facts(db, ids, sport=sport):
+                # The created_at bound keeps PostgreSQL on the old partitions
+                db.query(PredictionFact).filter(
+                    PredictionFact.sport == sport,
+                    PredictionFact.id.in_(ids),
+                    PredictionFact.created_at < cutoff
+                ).delete(synchronize_session=False)
+
+            # Pending predictions are kept until they are settled
+            reports.append(archive_table(model, cutoff, model.is_correct.isnot(None), on_delete=delete_facts))
+
+    return reports
+
+
+async def retention_job(context: ContextTypes.DEFAULT_TYPE):
+    """Daily retention run on the DB worker pool"""
+    try:
+        reports = await db_executor.run(run_retention)
+        rows = sum(report['rows'] for report in reports)
+        reclaimed = sum(report['bytes'] for report in reports)
+        logger.info(f"✅ Retention finished: {rows} rows, {reclaimed} bytes archived to {ARCHIVE_DIR}")
+    except Exception as e:
+        logger.error(f"❌ Retention job failed: {e}")
+
+
+def sweep_value_bets():
+    """Deactivate expired value bets"""
+    with DatabaseManager() as db:
+        return db.deactivate_expired_value_bets(batch_size=BATCH_SIZE, max_batches=MAX_BATCHES)
+
+
+async def value_bet_sweep_job(context: ContextTypes.DEFAULT_TYPE):
+    """Keep only live value bets in the active partial index"""
+    try:
+        await db_executor.run(sweep_value_bets)
+    except Exception as e:
+        logger.error(f"❌ Value bet sweep failed: {e}")
+
+
+def register_retention_jobs(job_queue):
+    """Schedule the daily retention run and the value bet sweep"""
+    job_queue.run_repeating(retention_job, interval=RETENTION_INTERVAL, first=300, name="retention")
+    job_queue.run_repeating(value_bet_sweep_job, interval=VALUE_BET_SWEEP_INTERVAL, first=30,
+                            name="value_bet_sweep")
+    logger.info(f"✅ Retention scheduled (logs {LOG_RETENTION_DAYS}d, predictions "
+                f"{f'{PREDICTION_RETENTION_DAYS}d' if PREDICTION_RETENTION_DAYS else 'kept'})")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"value_bets: {sweep_value_bets()} expired bets deactivated")
+    for report in run_retention():
+        print(f"{report['table']}: {report['rows']} rows, {report['bytes']} bytes "
+              f"({report['archive_bytes']} bytes compressed)")
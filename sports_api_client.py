@@ -6,14 +6,44 @@ Handles Football, Tennis, and Basketball APIs
 
 import os
 import logging
-import requests
+import time
+import random
+import asyncio
+import httpx
 from datetime import datetime
+from api_cache import ResponseCache, DiskCache
+from rate_limiter import HostQuota
+from circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
 class SportsAPIClient:
     """Unified API client for all sports from API-SPORTS"""
     
+    # Cache TTLs in seconds, per endpoint
+    CACHE_TTLS = {
+        'fixtures': 10 * 60,
+        'games': 10 * 60,
+        'predictions': 60 * 60,
+        'standings': 6 * 60 * 60,
+        'rankings': 6 * 60 * 60,
+        'h2h': 6 * 60 * 60,
+        'players': 24 * 60 * 60,
+        'statistics/players': 6 * 60 * 60
+    }
+    DEFAULT_CACHE_TTL = 5 * 60
+    
+    # How long past expiry data may still be served while revalidating
+    MAX_STALE = {
+        'fixtures': 60 * 60,
+        'games': 60 * 60,
+        'predictions': 60 * 60
+    }
+    DEFAULT_MAX_STALE = 24 * 60 * 60
+    
+    # Upstream statuses worth retrying
+    RETRYABLE_STATUS = {500, 502, 503, 504}
+    
     def __init__(self):
         self.api_key = os.environ.get("SPORTS_API_KEY", "")
         
@@ -28,86 +58,283 @@ class SportsAPIClient:
             "x-rapidapi-key": self.api_key
         }
         
+        # Connection pooling - one keep-alive pool per API host
+        self.timeout = float(os.environ.get("SPORTS_API_TIMEOUT", "10"))
+        self.limits = httpx.Limits(
+            max_connections=int(os.environ.get("SPORTS_API_MAX_CONNECTIONS", "10")),
+            max_keepalive_connections=int(os.environ.get("SPORTS_API_MAX_KEEPALIVE", "5")),
+            keepalive_expiry=30
+        )
+        self._clients = {}
+        
+        # Retries with jittered exponential backoff for transient errors
+        self.max_retries = int(os.environ.get("SPORTS_API_RETRIES", "2"))
+        self.backoff_base = 0.5
+        self.backoff_cap = 4.0
+        
+        # Response cache keyed by (host, endpoint, params)
+        self.cache = ResponseCache(int(os.environ.get("SPORTS_API_CACHE_SIZE", "500")))
+        self.stale_while_revalidate = os.environ.get("SPORTS_API_STALE_WHILE_REVALIDATE", "true").lower() == "true"
+        
+        # Optional on-disk tier that survives restarts
+        self.disk_cache = None
+        cache_path = os.environ.get("SPORTS_API_CACHE_PATH")
+        if cache_path:
+            try:
+                self.disk_cache = DiskCache(cache_path)
+            except Exception as e:
+                logger.error(f"❌ Disk cache unavailable: {e}")
+        
+        # In-flight requests, shared by concurrent identical callers
+        self._inflight = {}
+        self.coalesced = 0
+        
+        # Rate limiting and daily budget per API host
+        per_minute = int(os.environ.get("SPORTS_API_MINUTE_LIMIT", "10"))
+        per_day = int(os.environ.get("SPORTS_API_DAILY_LIMIT", "100"))
+        reserve = int(os.environ.get("SPORTS_API_DAILY_RESERVE", "5"))
+        self.quotas = {
+            self.football_url: HostQuota("Football", per_minute, per_day, reserve),
+            self.tennis_url: HostQuota("Tennis", per_minute, per_day, reserve),
+            self.basketball_url: HostQuota("Basketball", per_minute, per_day, reserve)
+        }
+        
+        # Circuit breaker per API host
+        self.breakers = {url: CircuitBreaker(quota.name) for url, quota in self.quotas.items()}
+        
         if not self.api_key:
             logger.warning("⚠️ SPORTS_API_KEY not set - APIs will use simulation mode")
     
-    def _make_request(self, url, endpoint, params=None):
-        """Make API request with error handling"""
+    def _get_client(self, url):
+        """Get (or lazily open) the pooled HTTP client for an API host"""
+        client = self._clients.get(url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 3.0)),
+                limits=self.limits
+            )
+            self._clients[url] = client
+        return client
+    
+    def _cache_key(self, url, endpoint, params):
+        """Build a hashable cache key for a request"""
+        return (url, endpoint, tuple(sorted((params or {}).items())))
+    
+    async def _make_request(self, url, endpoint, params=None, refresh=False):
+        """Make API request, served from cache when fresh (refresh=True forces upstream)"""
+        key = self._cache_key(url, endpoint, params)
+        if refresh:
+            return await asyncio.shield(self._start_load(key, url, endpoint, params))
+        
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        
+        # Cold key - warm it from the disk tier (e.g. right after a restart)
+        if self.disk_cache and key not in self.cache:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                data, expires_at = entry
+                self.cache.set(key, data, expires_at - time.time())
+                if expires_at > time.time():
+                    return data
+        
+        # Stale-while-revalidate: answer instantly, refresh once in the background
+        if self.stale_while_revalidate:
+            data = self.cache.get_stale(key, self.MAX_STALE.get(endpoint, self.DEFAULT_MAX_STALE))
+            if data is not None:
+                self._start_load(key, url, endpoint, params)
+                return data
+        
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(self._start_load(key, url, endpoint, params))
+    
+    def _start_load(self, key, url, endpoint, params):
+        """Single-flight: join an identical request that is already running"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, url, endpoint, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return task
+    
+    def _read_disk(self, key):
+        """Disk tier lookup, errors treated as a miss"""
+        try:
+            return self.disk_cache.get(key)
+        except Exception as e:
+            logger.error(f"❌ Disk cache read failed: {e}")
+            return None
+    
+    def _write_disk(self, key, data, ttl):
+        """Disk tier write, errors only logged"""
         try:
-            full_url = f"{url}/{endpoint}"
-            response = requests.get(full_url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            self.disk_cache.set(key, data, ttl)
+        except Exception as e:
+            logger.error(f"❌ Disk cache write failed: {e}")
+    
+    async def _load(self, key, url, endpoint, params):
+        """Fetch from upstream and populate the cache"""
+        # Host unhealthy - fail fast to stale cache (or None -> simulation)
+        if not self.breakers[url].allow_request():
+            return self.cache.get_stale(key)
+        
+        quota = self.quotas[url]
+        if not quota.try_acquire():
+            # Budget low - degrade to stale cache (or None -> simulation)
+            if not quota.low_budget:
+                quota.low_budget = True
+                logger.warning(f"⚠️ {quota.name} API rate limit reached ({quota.daily_remaining} left today) - serving cached data")
+            return self.cache.get_stale(key)
+        
+        data = await self._fetch(url, endpoint, params)
+        if data is None:
+            return self.cache.get_stale(key)
+        
+        ttl = self.CACHE_TTLS.get(endpoint, self.DEFAULT_CACHE_TTL)
+        self.cache.set(key, data, ttl)
+        if self.disk_cache:
+            await asyncio.to_thread(self._write_disk, key, data, ttl)
+        return data
+    
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff delay for a retry"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+    
+    async def _fetch(self, url, endpoint, params=None):
+        """Make upstream API request with retries and error handling"""
+        quota = self.quotas[url]
+        breaker = self.breakers[url]
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt))
+                if not quota.try_acquire():
+                    # Out of local budget, not a host failure - leave the breaker alone
+                    logger.warning(f"⚠️ API quota exhausted, giving up on {url}/{endpoint} after {attempt} attempts")
+                    return None
+            
+            try:
+                response = await self._get_client(url).get(f"/{endpoint}", params=params)
+            except httpx.TransportError as e:
+                logger.warning(f"⚠️ API request failed (attempt {attempt + 1}): {e!r}")
+                continue
+            
+            quota.update_from_headers(response.headers)
+            if response.status_code in self.RETRYABLE_STATUS:
+                logger.warning(f"⚠️ API returned {response.status_code} (attempt {attempt + 1})")
+                continue
+            
+            # Host answered - anything below is not a health problem
+            breaker.record_success()
+            if response.status_code == 429:
+                quota.exhaust_minute()
+            
+            try:
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"API Request failed: {e}")
+                return None
             
             if data.get('errors'):
                 logger.error(f"API Error: {data['errors']}")
                 return None
             
             return data.get('response', [])
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API Request failed: {e}")
-            return None
+        
+        # Every attempt hit a transport error or a 5xx
+        breaker.record_failure()
+        logger.error(f"API Request failed: {url}/{endpoint} after {attempt + 1} attempts")
+        return None
+    
+    async def close(self):
+        """Close all pooled connections"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        if self.disk_cache:
+            self.disk_cache.close()
+            self.disk_cache = None
+    
+    def get_cache_stats(self):
+        """Response cache counters"""
+        stats = self.cache.stats()
+        stats['coalesced'] = self.coalesced
+        stats['inflight'] = len(self._inflight)
+        return stats
+    
+    def get_quota_status(self):
+        """Remaining API budget per host"""
+        return [
+            {**quota.status(), 'circuit': self.breakers[url].state}
+            for url, quota in self.quotas.items()
+        ]
     
     # ========== FOOTBALL API METHODS ==========
     
-    def get_football_fixtures(self, date=None):
+    async def get_football_fixtures(self, date=None, refresh=False):
         """Get football fixtures for a date"""
         if not date:
             date = datetime.now().strftime("%Y-%m-%d")
-        return self._make_request(self.football_url, "fixtures", {"date": date})
+        return await self._make_request(self.football_url, "fixtures", {"date": date}, refresh)
 
-    def get_football_standings(self, league_id, season=None):
+    async def get_football_standings(self, league_id, season=None, refresh=False):
         """Get football standings"""
         if not season:
             season = datetime.now().year
-        return self._make_request(self.football_url, "standings", {
+        return await self._make_request(self.football_url, "standings", {
             "league": league_id,
             "season": season
-        })
+        }, refresh)
 
-    def get_football_predictions(self, fixture_id):
+    async def get_football_predictions(self, fixture_id):
         """Get predictions for a fixture"""
-        return self._make_request(self.football_url, "predictions", {"fixture": fixture_id})
+        return await self._make_request(self.football_url, "predictions", {"fixture": fixture_id})
 
     # ========== TENNIS API METHODS ==========
     
-    def get_tennis_matches_today(self):
+    async def get_tennis_matches_today(self, refresh=False):
         """Get today's tennis matches"""
         today = datetime.now().strftime("%Y-%m-%d")
-        return self._make_request(self.tennis_url, "games", {"date": today})
+        return await self._make_request(self.tennis_url, "games", {"date": today}, refresh)
     
-    def get_tennis_player_search(self, name):
+    async def get_tennis_player_search(self, name):
         """Search for tennis player by name"""
-        return self._make_request(self.tennis_url, "players", {"search": name})
+        return await self._make_request(self.tennis_url, "players", {"search": name})
     
-    def get_tennis_h2h(self, player1_id, player2_id):
+    async def get_tennis_h2h(self, player1_id, player2_id):
         """Get head-to-head stats between two players"""
-        return self._make_request(self.tennis_url, "h2h", {
+        return await self._make_request(self.tennis_url, "h2h", {
             "player1": player1_id,
             "player2": player2_id
         })
     
-    def get_tennis_rankings(self, tour='atp'):
+    async def get_tennis_rankings(self, tour='atp', refresh=False):
         """Get ATP or WTA rankings (tour: 'atp' or 'wta')"""
-        return self._make_request(self.tennis_url, "rankings", {"tour": tour})
+        return await self._make_request(self.tennis_url, "rankings", {"tour": tour}, refresh)
     
-    def get_tennis_player_stats(self, player_id, season=None):
+    async def get_tennis_player_stats(self, player_id, season=None):
         """Get player statistics for a season"""
         params = {"player": player_id}
         if season:
             params["season"] = season
-        return self._make_request(self.tennis_url, "statistics/players", params)
+        return await self._make_request(self.tennis_url, "statistics/players", params)
     
     # ========== BASKETBALL API METHODS (Future) ==========
     
-    def get_basketball_games_today(self):
+    async def get_basketball_games_today(self, refresh=False):
         """Get today's basketball games"""
         today = datetime.now().strftime("%Y-%m-%d")
-        return self._make_request(self.basketball_url, "games", {"date": today})
+        return await self._make_request(self.basketball_url, "games", {"date": today}, refresh)
     
-    def get_basketball_standings(self, league_id, season):
+    async def get_basketball_standings(self, league_id, season):
         """Get basketball standings"""
-        return self._make_request(self.basketball_url, "standings", {
+        return await self._make_request(self.basketball_url, "standings", {
             "league": league_id,
             "season": season
         })
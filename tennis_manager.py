@@ -13,8 +13,8 @@ logger = logging.getLogger(__name__)
 class TennisDataManager:
     """Manages tennis data and predictions"""
     
-    def __init__(self):
-        self.api = SportsAPIClient()
+    def __init__(self, api_client=None):
+        self.api = api_client or SportsAPIClient()
         
         # Sample tennis tournaments
         self.tournaments = {
@@ -30,11 +30,11 @@ class TennisDataManager:
         # Surface types
         self.surfaces = ['Hard', 'Clay', 'Grass', 'Carpet']
     
-    def get_todays_matches(self):
+    async def get_todays_matches(self):
         """Get today's tennis matches"""
         # Try API first
         if self.api.api_key:
-            matches_data = self.api.get_tennis_matches_today()
+            matches_data = await self.api.get_tennis_matches_today()
             if matches_data:
                 return self._format_api_matches(matches_data)
         
@@ -156,11 +156,11 @@ class TennisDataManager:
             }
         }
     
-    def get_rankings(self, tour='atp'):
+    async def get_rankings(self, tour='atp'):
         """Get ATP or WTA rankings"""
         # Try API first
         if self.api.api_key:
-            rankings_data = self.api.get_tennis_rankings(tour.lower())
+            rankings_data = await self.api.get_tennis_rankings(tour.lower())
             if rankings_data:
                 return self._format_api_rankings(rankings_data, tour)
         
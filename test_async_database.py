@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from models import ValueBet, PredictionFact
+from database import DatabaseManager, user_cache
+from async_database import AsyncDatabaseManager, async_url
+
+
+def seed_value_bets(url):
+    """Two live value bets and an expired one"""
+    with sessionmaker(bind=create_engine(url))() as db:
+        for match, edge, hours in (("Inter vs Milan", 7.3, 5), ("Roma vs Lazio", 5.1, 3), ("Old", 9.9, -2)):
+            db.add(ValueBet(match=match, bet_type="1X2", selection="1", edge=edge, is_active=True,
+                            expires_at=datetime.utcnow() + timedelta(hours=hours)))
+        db.commit()
+    return url
+
+
+def recent(stats):
+    return [(p.id, p.is_correct) for p in stats['recent_predictions']]
+
+
+def summary(stats):
+    return {**stats, 'recent_predictions': recent(stats)}
+
+
+def sync_scenario(url):
+    user_cache.clear()
+    with DatabaseManager(session=sessionmaker(bind=create_engine(url), expire_on_commit=False)()) as db:
+        user = db.get_or_create_user(501, username="alice", first_name="Alice")
+        again = db.get_or_create_user(501, first_name="Alicia")
+        saved = [
+            db.save_prediction(501, "Inter", "Milan", "Serie A", "1", 0.5, 0.3, 0.2, 0.7).id,
+            db.save_tennis_prediction(501, "Sinner", "Alcaraz", "ATP Finals", "Hard", "Sinner", 0.55, 0.45, 0.6).id,
+            db.save_basketball_prediction(502, "Lakers", "Celtics", "NBA", "Celtics", 0.4, 0.6, 0.65).id,
+        ]
+        facts = db.db.execute(select(PredictionFact.sport, PredictionFact.id, PredictionFact.home)
+                              .order_by(PredictionFact.sport)).all()
+        return {
+            'user': (user.id, user.username, user.first_name),
+            'again': (again.id, again.username, again.first_name),
+            'saved': saved,
+            'facts': [tuple(fact) for fact in facts],
+            'football': summary(db.get_user_stats(501)),
+            'tennis': summary(db.get_tennis_stats(501)),
+            'basketball': summary(db.get_basketball_stats(502)),
+            'value_bets': [bet.match for bet in db.get_todays_value_bets()],
+        }
+
+
+async def async_scenario(url):
+    user_cache.clear()
+    engine = create_async_engine(async_url(url))
+    try:
+        async with AsyncDatabaseManager(session=async_sessionmaker(engine, expire_on_commit=False)()) as db:
+            user = await db.get_or_create_user(501, username="alice", first_name="Alice")
+            again = await db.get_or_create_user(501, first_name="Alicia")
+            saved = [
+                (await db.save_prediction(501, "Inter", "Milan", "Serie A", "1", 0.5, 0.3, 0.2, 0.7)).id,
+                (await db.save_tennis_prediction(501, "Sinner", "Alcaraz", "ATP Finals", "Hard", "Sinner", 0.55, 0.45, 0.6)).id,
+                (await db.save_basketball_prediction(502, "Lakers", "Celtics", "NBA", "Celtics", 0.4, 0.6, 0.65)).id,
+            ]
+            facts = (await db.db.execute(select(PredictionFact.sport, PredictionFact.id, PredictionFact.home)
+                                         .order_by(PredictionFact.sport))).all()
+            return {
+                'user': (user.id, user.username, user.first_name),
+                'again': (again.id, again.username, again.first_name),
+                'saved': saved,
+                'facts': [tuple(fact) for fact in facts],
+                'football': summary(await db.get_user_stats(501)),
+                'tennis': summary(await db.get_tennis_stats(501)),
+                'basketball': summary(await db.get_basketball_stats(502)),
+                'value_bets': [bet.match for bet in await db.get_todays_value_bets()],
+            }
+    finally:
+        await engine.dispose()
+
+
+def test_async_url():
+    assert async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert async_url("sqlite:///bot.db") == "sqlite+aiosqlite:///bot.db"
+
+
+def test_async_parity(make_database):
+    expected = sync_scenario(seed_value_bets(make_database("sync.db")))
+    actual = asyncio.run(async_scenario(seed_value_bets(make_database("async.db"))))
+
+    assert actual == expected
+    assert expected['again'] == (1, "alice", "Alicia")
+    assert expected['football']['total_predictions'] == 1
+    assert expected['football']['pending_predictions'] == 1
+    assert len(expected['facts']) == 3
+    assert expected['value_bets'] == ["Inter vs Milan", "Roma vs Lazio"]
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models import User, Prediction, PredictionFact
+from database import DatabaseManager, user_cache
+from db_router import ReadRouter
+
+
+def session_factory(url):
+    return sessionmaker(autoflush=False, expire_on_commit=False, bind=create_engine(url))
+
+
+def seed(factory, telegram_id, predictions):
+    with factory() as db:
+        user = User(telegram_id=telegram_id, first_name="Test")
+        db.add(user)
+        db.flush()
+        for i in range(predictions):
+            db.add(Prediction(user_id=user.id, home_team=f"Home {i}", away_team="Away"))
+        db.commit()
+
+
+def read_stats(router, telegram_id):
+    with DatabaseManager(session=router.read_session(), read_only=True) as db:
+        return db.get_user_stats(telegram_id)
+
+
+def test_read_router(tmp_path, make_database):
+    # SQLite stand-ins for a PostgreSQL primary and replica
+    primary = session_factory(make_database("primary.db"))
+    replica = session_factory(make_database("replica.db"))
+    # Different contents, so each read shows which database answered
+    seed(primary, 1001, predictions=3)
+    seed(replica, 1001, predictions=1)
+
+    def recent_count(router):
+        user_cache.clear()
+        return len(read_stats(router, 1001)['recent_predictions'])
+
+    # Healthy replica (SQLite reports zero lag) serves reads
+    router = ReadRouter(primary, replica, max_lag=5, check_interval=60)
+    assert recent_count(router) == 1
+    assert router.lag == 0
+    assert router.stats()['replica_reads'] == 1
+
+    # Lag probe is cached between checks
+    probes = []
+    router.measure_lag = lambda: probes.append(1) or 0.0
+    router._checked_at = None
+    router.read_session().close()
+    router.read_session().close()
+    assert len(probes) == 1
+
+    # Lagging replica falls back to the primary
+    lagging = ReadRouter(primary, replica, max_lag=5, check_interval=60)
+    lagging.measure_lag = lambda: 30.0
+    assert recent_count(lagging) == 3
+    assert lagging.stats()['fallbacks'] == 1
+
+    # Unreachable replica falls back to the primary
+    unreachable = sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"))
+    broken = ReadRouter(primary, unreachable, check_interval=60)
+    assert recent_count(broken) == 3
+    assert broken.stats()['lag'] is None
+
+    # No replica configured - always the primary
+    assert recent_count(ReadRouter(primary)) == 3
+
+    # Read-only sessions never create users
+    user_cache.clear()
+    assert read_stats(router, 2002)['total_predictions'] == 0
+    with primary() as db:
+        assert db.query(User).filter(User.telegram_id == 2002).count() == 0
+
+    # Unknown users don't pick up predictions whose user_id is NULL
+    with replica() as db:
+        db.add(Prediction(home_team="Orphan", away_team="Away"))
+        db.add(PredictionFact(sport="football", id=99, created_at=datetime.utcnow(), home="Orphan", away="Away"))
+        db.commit()
+    user_cache.clear()
+    with DatabaseManager(session=router.read_session(), read_only=True) as db:
+        assert db.get_user_stats(777)['recent_predictions'] == []
+        assert all(stats['recent_predictions'] == [] for stats in db.get_all_stats(777).values())
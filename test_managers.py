@@ -1,4 +1,5 @@
 
+import asyncio
 import logging
 from tennis_manager import TennisDataManager
 from basketball_manager import BasketballDataManager
@@ -6,14 +7,14 @@ from basketball_manager import BasketballDataManager
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 
-def test_managers():
+async def check_managers():
     print("🧪 Testing Managers...")
     
     # 1. Test Tennis Rankings
     print("\n🎾 Testing Tennis Rankings (ATP)...")
     tm = TennisDataManager()
     try:
-        rankings = tm.get_rankings('ATP')
+        rankings = await tm.get_rankings('ATP')
         if rankings and rankings.get('rankings'):
             print(f"✅ Success! Got {len(rankings['rankings'])} rankings.")
             print(f"Top player: {rankings['rankings'][0]}")
@@ -25,7 +26,7 @@ def test_managers():
     # 2. Test Tennis Matches
     print("\n🎾 Testing Tennis Matches...")
     try:
-        matches = tm.get_todays_matches()
+        matches = await tm.get_todays_matches()
         print(f"✅ Success! Got {len(matches)} matches.")
     except Exception as e:
         print(f"❌ CRASH: {e}")
@@ -46,10 +47,17 @@ def test_managers():
     # 4. Test Basketball Matches
     print("\n🏀 Testing Basketball Matches...")
     try:
-        matches = bm.get_todays_matches()
+        matches = await bm.get_todays_matches()
         print(f"✅ Success! Got {len(matches)} matches.")
     except Exception as e:
         print(f"❌ CRASH: {e}")
 
+    # One event loop for every check - pooled clients are bound to the loop that opened them
+    await tm.api.close()
+    await bm.api.close()
+
+def test_managers():
+    asyncio.run(check_managers())
+
 if __name__ == "__main__":
     test_managers()
@@ -0,0 +1,65 @@
+import json
+import asyncio
+
+from sqlalchemy.exc import DataError, OperationalError
+from prediction_writer import PredictionWriter
+
+
+class RejectingExecutor:
+    """Stands in for the DB pool: refuses rows named "bad", or everything while down"""
+
+    def __init__(self):
+        self.written = []
+        self.down = False
+
+    async def run(self, func, batch):
+        if self.down:
+            raise OperationalError("INSERT", {}, ConnectionError("server closed the connection"))
+        if any(row.get('home_team') == "bad" for row in batch):
+            raise DataError("INSERT", {}, ValueError("value too long for type character varying(100)"))
+        self.written.extend(row['home_team'] for row in batch)
+
+
+def submit(writer, home_team):
+    return writer.submit('football', 1, home_team=home_team, away_team="Away", league="Serie A",
+                         predicted_result="1", home_prob=50, draw_prob=30, away_prob=20, confidence=50)
+
+
+def test_rejected_rows_do_not_block_the_queue(tmp_path):
+    executor = RejectingExecutor()
+    writer = PredictionWriter(batch_size=10, max_retries=1, executor=executor,
+                              spool_path=tmp_path / "spool.jsonl", dead_letter_path=tmp_path / "rejected.jsonl")
+
+    async def scenario():
+        # A refused row is dead-lettered, the rest of its batch is written, nothing backs off
+        for name in ("good1", "bad", "good2"):
+            submit(writer, name)
+        await writer.flush()
+        assert executor.written == ["good1", "good2"]
+        assert writer._retry_at == 0.0
+
+        # Outage: the batch is spooled, then replayed by the next successful flush
+        executor.down = True
+        submit(writer, "late0")
+        await writer.flush()
+        assert writer.spooled == 1
+        executor.down = False
+        writer._retry_at = 0.0
+        submit(writer, "late1")
+        await writer.flush()
+        await writer.flush()
+        assert executor.written == ["good1", "good2", "late1", "late0"]
+
+    asyncio.run(scenario())
+
+    assert writer.stats()['pending'] == 0
+    assert writer.stats()['dead_lettered'] == 1
+    rejected = [json.loads(line) for line in open(tmp_path / "rejected.jsonl")]
+    assert [row['home_team'] for row in rejected] == ["bad"]
+    assert "value too long" in rejected[0]['error']
+
+
+def test_submit_fits_text_to_columns():
+    writer = PredictionWriter()
+    assert submit(writer, "x" * 150)
+    assert len(writer._pending[0]['home_team']) == 100
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Workers - Bounded thread pool for blocking work (SQLAlchemy sessions)
+Keeps synchronous DB calls off the python-telegram-bot event loop
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingExecutor:
+    """Bounded executor with queue-depth metrics"""
+
+    def __init__(self, name, max_workers, max_queue):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # Admission control: callers wait here once workers and queue are full
+        self._admission = asyncio.Semaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0      # blocked on admission
+        self.queued = 0       # admitted, waiting for a worker thread
+        self.active = 0       # running on a worker thread
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _call(self, func, args, kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on a worker thread and await the result"""
+        self.waiting += 1
+        try:
+            await self._admission.acquire()
+        finally:
+            self.waiting -= 1
+
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._call, func, args, kwargs)
+        finally:
+            self._admission.release()
+
+    def stats(self):
+        """Executor metrics for monitoring"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'workers': self.max_workers,
+                'active': self.active,
+                'queued': self.queued,
+                'waiting': self.waiting,
+                'peak_queued': self.peak_queued,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+# One worker per pooled DB connection, so queries never wait on the pool inside a thread
+db_executor = BlockingExecutor(
+    "db",
+    max_workers=int(os.environ.get("DB_WORKERS", os.environ.get("DB_POOL_SIZE", "5"))),
+    max_queue=int(os.environ.get("DB_WORKER_QUEUE", "100"))
+)